@@ -288,7 +288,7 @@ async def get_trending_feed(
             dexscreener_url=token.dexscreener_url,
             total_mentions=total_mentions,
             human_discussions=mentions.human_discussions if mentions else 0,
-            sources=mentions.sources if mentions else [],
+            sources=sorted(mentions.sources) if mentions else [],
             sentiment=mentions.to_dict()["sentiment"] if mentions else {"bullish": 0, "bearish": 0, "neutral": 0},
             kol_holders=kol_holders,
             kol_count=kol_data.total_kol_holders if kol_data else 0,
@@ -381,7 +381,7 @@ async def get_token_detail(
         dexscreener_url=token.dexscreener_url if token else f"https://dexscreener.com/{chain}/{address}",
         total_mentions=mentions.total_mentions,
         human_discussions=mentions.human_discussions,
-        sources=mentions.sources,
+        sources=sorted(mentions.sources),
         sentiment=mentions.to_dict()["sentiment"],
         kol_holders=kol_holders,
         kol_count=kol_data.total_kol_holders if kol_data else 0,
@@ -119,6 +119,17 @@ async def lifespan(app: FastAPI):
     except Exception:
         pass  # Qdrant was not connected
     
+    # Release the trending services' pooled HTTP/2 connections
+    from app.services.trending import trending_service
+    from app.services.trending.chat_summarizer import chat_summarizer
+    from app.services.trending.contextual_scanner import contextual_scanner
+    from app.services.trending.chat_first_scanner import chat_first_scanner
+    for service in (trending_service, chat_summarizer, contextual_scanner, chat_first_scanner):
+        try:
+            await service.close()
+        except Exception:
+            pass  # Shutting down anyway
+    
     print("[DEBUG] lifespan: Shutdown complete!", flush=True)
     logger.info("Shutdown complete!")
 
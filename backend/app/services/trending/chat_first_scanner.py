@@ -11,20 +11,39 @@ No limiting to "trending" tokens - we find what's actually being discussed.
 """
 
 import re
+import time
+import heapq
+import asyncio
 import httpx
+import orjson
 from typing import Dict, Any, List, Optional, Set, Tuple
 from dataclasses import dataclass, field
-from datetime import datetime, timedelta
-from collections import defaultdict
+from datetime import datetime
+from collections import Counter, defaultdict
 import structlog
 import os
 
+from app.core.redis import get_redis
+
 logger = structlog.get_logger()
 
 # Groq API for summaries
 GROQ_API_KEY = os.getenv("GROQ_API_KEY", "")
 GROQ_MODEL = "llama-3.1-8b-instant"
 
+# Max concurrent outbound requests (DexScreener + Groq) per scan
+MAX_CONCURRENT_REQUESTS = 10
+
+# Ticker -> address resolutions are persisted in Redis across restarts
+TICKER_REDIS_PREFIX = "chat_scanner:"
+TICKER_CACHE_TTL = 24 * 60 * 60  # 1 day
+TICKER_NEGATIVE_CACHE_TTL = 60 * 60  # 1 hour for tickers with no match
+
+# DexScreener /latest/dex/tokens/ accepts up to 30 comma-separated addresses,
+# and returns at most 30 pairs per response
+DEXSCREENER_BATCH_SIZE = 30
+DEXSCREENER_MAX_PAIRS = 30
+
 
 # ============================================================================
 # PATTERNS FOR FINDING TOKENS
@@ -32,9 +51,11 @@ GROQ_MODEL = "llama-3.1-8b-instant"
 
 # Solana address pattern (base58, 32-44 chars)
 SOLANA_ADDR_PATTERN = r'[1-9A-HJ-NP-Za-km-z]{32,44}'
+SOLANA_ADDR_REGEX = re.compile(SOLANA_ADDR_PATTERN)
 
 # EVM address pattern
 EVM_ADDR_PATTERN = r'0x[a-fA-F0-9]{40}'
+EVM_ADDR_REGEX = re.compile(EVM_ADDR_PATTERN)
 
 # Token links - extract address from URL
 TOKEN_URL_PATTERNS = [
@@ -54,8 +75,35 @@ TOKEN_URL_PATTERNS = [
     (r'bscscan\.com/token/(0x[a-fA-F0-9]{40})', 'bsc'),
 ]
 
+# All URL patterns as one alternation so a message is scanned once.
+# Each pattern has exactly one capture group, so match.lastindex - 1
+# indexes back into TOKEN_URL_PATTERNS for the chain.
+TOKEN_URL_REGEX = re.compile(
+    '|'.join(f'(?:{pattern})' for pattern, _ in TOKEN_URL_PATTERNS),
+    re.IGNORECASE,
+)
+TOKEN_URL_CHAINS = tuple(chain for _, chain in TOKEN_URL_PATTERNS)
+
+# Chain hints for raw EVM addresses (first hint in the message wins)
+EVM_CHAIN_HINT_REGEX = re.compile(r'\b(base|bsc|bnb|ethereum|eth|polygon|matic)\b')
+EVM_CHAIN_HINTS = {
+    'base': 'base',
+    'bsc': 'bsc',
+    'bnb': 'bsc',
+    'ethereum': 'ethereum',
+    'eth': 'ethereum',
+    'polygon': 'polygon',
+    'matic': 'polygon',
+}
+
 # $SYMBOL pattern - captures tickers like $PEPE, $WIF
 TICKER_PATTERN = r'\$([A-Za-z][A-Za-z0-9]{1,10})\b'
+TICKER_REGEX = re.compile(TICKER_PATTERN)
+
+# Every URL/Solana/EVM pattern above needs a run of 32+ alphanumerics
+# (superset of base58/hex). One search for such a run gates all three
+# address scans; tickers only need a '$'.
+ADDRESS_RUN_REGEX = re.compile(r'[0-9A-Za-z]{32}')
 
 # Common false positive addresses to skip
 FALSE_POSITIVE_ADDRS = {
@@ -63,9 +111,31 @@ FALSE_POSITIVE_ADDRS = {
     'EPjFWdd5AufqSSqeM2qN1xzybapC8G4wEGGkZwyTDt1v',  # USDC
     '11111111111111111111111111111111',  # System program
 }
+# Cheap prefix gate so most addresses skip hashing into FALSE_POSITIVE_ADDRS
+FALSE_POSITIVE_PREFIXES = frozenset(addr[:3] for addr in FALSE_POSITIVE_ADDRS)
+
+# Common words / base assets that look like $TICKERS
+TICKER_STOPWORDS = frozenset({
+    'THE', 'AND', 'FOR', 'ARE', 'BUT', 'NOT', 'YOU', 'ALL',
+    'CAN', 'HAD', 'HER', 'WAS', 'ONE', 'OUR', 'OUT', 'USD',
+    'SOL', 'ETH', 'BTC', 'BNB', 'USDC', 'USDT',
+})
+TICKER_STOPWORD_MAX_LEN = max(len(word) for word in TICKER_STOPWORDS)
+
+# Keyword sentiment for per-chat summaries
+BULLISH_WORDS = frozenset({'bullish', 'moon', 'pump', 'gem', 'alpha', 'lfg', 'buy', 'long', '🚀', '🔥'})
+BEARISH_WORDS = frozenset({'bearish', 'dump', 'rug', 'scam', 'sell', 'short', 'dead', '📉'})
+
+# Splits chat text into words and standalone sentiment emoji
+SENTIMENT_TOKEN_PATTERN = re.compile(r'\w+|[🚀🔥📉]')
+
+
+def _pair_liquidity(pair: Dict) -> float:
+    """USD liquidity of a DexScreener pair (0 when missing)"""
+    return (pair.get("liquidity") or {}).get("usd") or 0
 
 
-@dataclass
+@dataclass(slots=True)
 class DiscoveredToken:
     """A token discovered in chat messages"""
     address: str
@@ -114,15 +184,26 @@ class ChatFirstScanner:
     def __init__(self):
         self._client: Optional[httpx.AsyncClient] = None
         self._ticker_cache: Dict[str, str] = {}  # ticker -> address mapping
+        self._pending_tickers: Dict[str, asyncio.Event] = {}
         self._enrichment_cache: Dict[str, Dict] = {}
-        self._cache_time: Dict[str, datetime] = {}
-        self.cache_duration = timedelta(minutes=3)
+        self._cache_time: Dict[str, float] = {}  # cache_key -> time.monotonic() at insert
+        self.cache_duration_s = 180.0
+        self._semaphore = asyncio.Semaphore(MAX_CONCURRENT_REQUESTS)
     
     async def _get_client(self) -> httpx.AsyncClient:
         if self._client is None or self._client.is_closed:
-            self._client = httpx.AsyncClient(timeout=30.0)
+            self._client = httpx.AsyncClient(
+                timeout=30.0,
+                http2=True,
+                limits=httpx.Limits(max_connections=20),
+            )
         return self._client
     
+    async def close(self):
+        if self._client:
+            await self._client.aclose()
+            self._client = None
+    
     def _extract_tokens_from_message(self, text: str) -> List[Tuple[str, str, str]]:
         """
         Extract all token references from a message.
@@ -130,43 +211,99 @@ class ChatFirstScanner:
         Returns:
             List of (address_or_ticker, chain, method) tuples
         """
-        found = []
+        has_address_run = ADDRESS_RUN_REGEX.search(text) is not None
+        if not has_address_run and '$' not in text:
+            return []
         
-        # 1. Extract from URLs first (most reliable)
-        for pattern, chain in TOKEN_URL_PATTERNS:
-            matches = re.findall(pattern, text, re.IGNORECASE)
-            for addr in matches:
-                if addr and addr not in FALSE_POSITIVE_ADDRS:
-                    found.append((addr, chain, 'url'))
-        
-        # 2. Extract raw Solana addresses
-        sol_addrs = re.findall(SOLANA_ADDR_PATTERN, text)
-        for addr in sol_addrs:
-            if addr not in FALSE_POSITIVE_ADDRS and len(addr) >= 32:
-                # Skip if looks like transaction hash context
-                if not any(x in text.lower() for x in ['tx:', 'transaction:', 'sig:', 'signature:']):
-                    # Check it's not already found via URL
-                    if not any(f[0] == addr for f in found):
-                        found.append((addr, 'solana', 'address'))
+        found = []
+        seen: Set[str] = set()  # lowercased addresses already in found
         
-        # 3. Extract raw EVM addresses
-        evm_addrs = re.findall(EVM_ADDR_PATTERN, text)
-        for addr in evm_addrs:
-            if not any(f[0].lower() == addr.lower() for f in found):
-                found.append((addr, 'ethereum', 'address'))  # Will detect actual chain later
+        # 1-3. Addresses (URLs, raw Solana, raw EVM) - skipped without an address run
+        if has_address_run:
+            self._extract_addresses(text, found, seen)
         
         # 4. Extract $TICKERS
-        tickers = re.findall(TICKER_PATTERN, text)
+        tickers = TICKER_REGEX.findall(text)
         for ticker in tickers:
             ticker_upper = ticker.upper()
             # Skip common words that look like tickers
-            if ticker_upper not in {'THE', 'AND', 'FOR', 'ARE', 'BUT', 'NOT', 'YOU', 'ALL', 
-                                    'CAN', 'HAD', 'HER', 'WAS', 'ONE', 'OUR', 'OUT', 'USD',
-                                    'SOL', 'ETH', 'BTC', 'BNB', 'USDC', 'USDT'}:
+            if len(ticker_upper) > TICKER_STOPWORD_MAX_LEN or ticker_upper not in TICKER_STOPWORDS:
                 found.append((ticker_upper, 'unknown', 'ticker'))
         
         return found
     
+    def _extract_addresses(self, text: str, found: List[Tuple[str, str, str]], seen: Set[str]):
+        """Append URL, Solana and EVM address references in text to found"""
+        # 1. Extract from URLs first (most reliable)
+        for match in TOKEN_URL_REGEX.finditer(text):
+            addr = match.group(match.lastindex)
+            if addr and not (addr[:3] in FALSE_POSITIVE_PREFIXES and addr in FALSE_POSITIVE_ADDRS):
+                seen.add(addr.lower())
+                found.append((addr, TOKEN_URL_CHAINS[match.lastindex - 1], 'url'))
+        
+        # 2. Extract raw Solana addresses
+        # Skip if looks like transaction hash context (checked once per message)
+        text_lower = text.lower()
+        is_tx_context = any(x in text_lower for x in ('tx:', 'transaction:', 'sig:', 'signature:'))
+        sol_addrs = [] if is_tx_context else SOLANA_ADDR_REGEX.findall(text)
+        for addr in sol_addrs:
+            if addr[:3] in FALSE_POSITIVE_PREFIXES and addr in FALSE_POSITIVE_ADDRS:
+                continue
+            if len(addr) >= 32:
+                # Check it's not already found via URL
+                key = addr.lower()
+                if key not in seen:
+                    seen.add(key)
+                    found.append((addr, 'solana', 'address'))
+        
+        # 3. Extract raw EVM addresses
+        evm_addrs = EVM_ADDR_REGEX.findall(text)
+        if evm_addrs:
+            # Guess the chain from context; enrichment corrects it from the pair
+            hint = EVM_CHAIN_HINT_REGEX.search(text_lower)
+            evm_chain = EVM_CHAIN_HINTS[hint.group(1)] if hint else 'ethereum'
+        for addr in evm_addrs:
+            key = addr.lower()
+            if key not in seen:
+                seen.add(key)
+                found.append((addr, evm_chain, 'address'))
+    
+    def _extract_tokens_from_messages(
+        self, messages: List[Dict[str, Any]]
+    ) -> List[List[Tuple[str, str, str]]]:
+        """Run _extract_tokens_from_message over a batch (one result list per message)"""
+        return [
+            self._extract_tokens_from_message(msg.get("text") or "")
+            for msg in messages
+        ]
+    
+    @staticmethod
+    def _parse_ticker_cache(cached: Optional[str]) -> Optional[Tuple[str, str]]:
+        """Decode an "address:chain" ticker cache entry ("" = negative result)"""
+        if cached and ':' in cached:
+            address, chain = cached.split(':', 1)
+            return address, chain
+        return None
+    
+    async def _get_persisted_ticker(self, cache_key: str) -> Optional[str]:
+        """Read a ticker resolution from Redis (survives restarts)"""
+        try:
+            redis = await get_redis()
+            return await redis.get(f"{TICKER_REDIS_PREFIX}{cache_key}")
+        except Exception as e:
+            logger.debug("ticker_cache_read_failed", key=cache_key, error=str(e))
+            return None
+    
+    async def _persist_ticker(self, cache_key: str, value: str):
+        """Store a ticker resolution in memory and in Redis"""
+        self._ticker_cache[cache_key] = value
+        ttl = TICKER_CACHE_TTL if value else TICKER_NEGATIVE_CACHE_TTL
+        try:
+            redis = await get_redis()
+            await redis.setex(f"{TICKER_REDIS_PREFIX}{cache_key}", ttl, value)
+        except Exception as e:
+            logger.debug("ticker_cache_write_failed", key=cache_key, error=str(e))
+    
     async def _resolve_ticker(self, ticker: str) -> Optional[Tuple[str, str]]:
         """
         Resolve a ticker symbol to an address using DexScreener search.
@@ -177,101 +314,184 @@ class ChatFirstScanner:
         # Check cache
         cache_key = f"ticker:{ticker}"
         if cache_key in self._ticker_cache:
-            cached = self._ticker_cache[cache_key]
-            if cached:
-                return cached.split(':', 1) if ':' in cached else None
-            return None
+            return self._parse_ticker_cache(self._ticker_cache[cache_key])
+        
+        # Check if another request is already resolving this ticker
+        if cache_key in self._pending_tickers:
+            await self._pending_tickers[cache_key].wait()
+            return self._parse_ticker_cache(self._ticker_cache.get(cache_key))
+        
+        # Mark as pending
+        self._pending_tickers[cache_key] = asyncio.Event()
         
         try:
+            # Check persistent cache
+            cached = await self._get_persisted_ticker(cache_key)
+            if cached is not None:
+                self._ticker_cache[cache_key] = cached
+                return self._parse_ticker_cache(cached)
+            
             client = await self._get_client()
-            response = await client.get(
-                f"https://api.dexscreener.com/latest/dex/search",
-                params={"q": ticker}
+            async with self._semaphore:
+                response = await client.get(
+                    f"https://api.dexscreener.com/latest/dex/search",
+                    params={"q": ticker}
+                )
+            
+            if response.status_code != 200:
+                # Rate limits and outages say nothing about the ticker - don't cache them
+                logger.warning("ticker_resolve_failed", ticker=ticker, status=response.status_code)
+                return None
+            
+            data = orjson.loads(response.content)
+            pairs = data.get("pairs") or []
+            
+            # Find best match - highest liquidity pair with this symbol
+            ticker_upper = ticker.upper()
+            best_pair = max(
+                (
+                    pair for pair in pairs[:20]  # Check top 20 results
+                    if pair.get("baseToken", {}).get("symbol", "").upper() == ticker_upper
+                ),
+                key=_pair_liquidity,
+                default=None,
             )
             
-            if response.status_code == 200:
-                data = response.json()
-                pairs = data.get("pairs", [])
-                
-                # Find best match - prefer high liquidity Solana tokens
-                best = None
-                best_liquidity = 0
-                
-                for pair in pairs[:20]:  # Check top 20 results
-                    base = pair.get("baseToken", {})
-                    if base.get("symbol", "").upper() == ticker:
-                        liquidity = pair.get("liquidity", {}).get("usd", 0) or 0
-                        if liquidity > best_liquidity:
-                            best = (base.get("address"), pair.get("chainId", "solana"))
-                            best_liquidity = liquidity
-                
-                if best:
-                    self._ticker_cache[cache_key] = f"{best[0]}:{best[1]}"
-                    return best
-                
-            self._ticker_cache[cache_key] = ""  # Cache negative result
+            best = None
+            if best_pair and _pair_liquidity(best_pair) > 0:
+                best = (best_pair["baseToken"].get("address"), best_pair.get("chainId", "solana"))
+            
+            if best:
+                await self._persist_ticker(cache_key, f"{best[0]}:{best[1]}")
+                return best
+            
+            await self._persist_ticker(cache_key, "")  # Cache negative result
             return None
             
         except Exception as e:
             logger.warning("ticker_resolve_failed", ticker=ticker, error=str(e))
             return None
+        finally:
+            # Signal completion
+            self._pending_tickers.pop(cache_key).set()
     
-    async def _enrich_token(self, token: DiscoveredToken) -> DiscoveredToken:
-        """Enrich a token with DexScreener market data"""
-        cache_key = token.address.lower()
+    async def _enrich_batch(self, tokens: List[DiscoveredToken]) -> List[DiscoveredToken]:
+        """
+        Enrich tokens with DexScreener market data.
         
-        # Check cache
-        if cache_key in self._enrichment_cache:
-            cache_time = self._cache_time.get(cache_key, datetime.min)
-            if datetime.utcnow() - cache_time < self.cache_duration:
-                data = self._enrichment_cache[cache_key]
-                self._apply_enrichment(token, data)
-                return token
+        Uncached tokens are looked up DEXSCREENER_BATCH_SIZE addresses
+        per request instead of one request per token.
+        """
+        to_fetch: List[DiscoveredToken] = []
+        now = time.monotonic()
+        
+        for token in tokens:
+            cache_key = token.address.lower()
+            
+            # Check cache
+            if cache_key in self._enrichment_cache:
+                if now - self._cache_time.get(cache_key, 0.0) < self.cache_duration_s:
+                    self._apply_enrichment(token, self._enrichment_cache[cache_key])
+                    continue
+            
+            to_fetch.append(token)
+        
+        chunks = [
+            to_fetch[i:i + DEXSCREENER_BATCH_SIZE]
+            for i in range(0, len(to_fetch), DEXSCREENER_BATCH_SIZE)
+        ]
+        await asyncio.gather(*(self._enrich_chunk(chunk) for chunk in chunks))
+        
+        return tokens
+    
+    async def _enrich_chunk(self, tokens: List[DiscoveredToken]):
+        """Fetch one DexScreener batch and apply the best pair to each token"""
+        addresses = ",".join(t.address for t in tokens)
         
         try:
             client = await self._get_client()
-            response = await client.get(
-                f"https://api.dexscreener.com/latest/dex/tokens/{token.address}"
-            )
+            async with self._semaphore:
+                response = await client.get(
+                    f"https://api.dexscreener.com/latest/dex/tokens/{addresses}"
+                )
             
-            if response.status_code == 200:
-                data = response.json()
-                pairs = data.get("pairs", [])
-                
-                if pairs:
-                    # Use highest liquidity pair
-                    pairs.sort(key=lambda x: x.get("liquidity", {}).get("usd", 0) or 0, reverse=True)
-                    pair = pairs[0]
-                    
-                    base = pair.get("baseToken", {})
-                    if base.get("address", "").lower() != token.address.lower():
-                        base = pair.get("quoteToken", {})
-                    
-                    enrichment = {
-                        "symbol": base.get("symbol", "???"),
-                        "name": base.get("name", "Unknown"),
-                        "price_usd": float(pair.get("priceUsd") or 0),
-                        "market_cap": pair.get("fdv"),
-                        "liquidity_usd": pair.get("liquidity", {}).get("usd"),
-                        "price_change_1h": pair.get("priceChange", {}).get("h1"),
-                        "price_change_24h": pair.get("priceChange", {}).get("h24"),
-                        "volume_24h": pair.get("volume", {}).get("h24"),
-                        "dex_url": pair.get("url"),
-                        "image_url": pair.get("info", {}).get("imageUrl"),
-                        "chain": pair.get("chainId", token.chain),
-                        "pair_created_at": pair.get("pairCreatedAt"),
-                    }
-                    
-                    # Cache it
-                    self._enrichment_cache[cache_key] = enrichment
-                    self._cache_time[cache_key] = datetime.utcnow()
-                    
-                    self._apply_enrichment(token, enrichment)
-                    
+            if response.status_code != 200:
+                return
+            
+            pairs = orjson.loads(response.content).get("pairs") or []
         except Exception as e:
-            logger.warning("enrich_failed", address=token.address, error=str(e))
+            logger.warning("enrich_batch_failed", count=len(tokens), error=str(e))
+            return
         
-        return token
+        # Bucket pairs by the token address they trade (sections can be null)
+        pairs_by_addr: Dict[str, List[Dict]] = defaultdict(list)
+        for pair in pairs:
+            base_addr = ((pair.get("baseToken") or {}).get("address") or "").lower()
+            quote_addr = ((pair.get("quoteToken") or {}).get("address") or "").lower()
+            pairs_by_addr[base_addr].append(pair)
+            if quote_addr != base_addr:
+                pairs_by_addr[quote_addr].append(pair)
+        
+        # A full response may have crowded out other tokens' pairs
+        truncated = len(tokens) > 1 and len(pairs) >= DEXSCREENER_MAX_PAIRS
+        
+        missing: List[DiscoveredToken] = []
+        for token in tokens:
+            token_pairs = pairs_by_addr.get(token.address.lower())
+            if not token_pairs:
+                if truncated:
+                    missing.append(token)
+                continue
+            
+            # A malformed pair only costs its own token
+            try:
+                self._enrich_from_pairs(token, token_pairs)
+            except Exception as e:
+                logger.warning("enrich_failed", address=token.address, error=str(e))
+        
+        # Look those up on their own, like before batching
+        await asyncio.gather(*(self._enrich_chunk([token]) for token in missing))
+    
+    def _enrich_from_pairs(self, token: DiscoveredToken, pairs: List[Dict]):
+        """Cache and apply the token's highest liquidity pair"""
+        cache_key = token.address.lower()
+        
+        # Prefer pairs on the chain the token was seen on
+        chain_pairs = [p for p in pairs if p.get("chainId") == token.chain]
+        if chain_pairs:
+            pairs = chain_pairs
+        
+        # Use highest liquidity pair
+        pair = max(pairs, key=_pair_liquidity)
+        
+        base = pair.get("baseToken") or {}
+        if (base.get("address") or "").lower() != cache_key:
+            base = pair.get("quoteToken") or {}
+        liquidity = pair.get("liquidity") or {}
+        price_change = pair.get("priceChange") or {}
+        volume = pair.get("volume") or {}
+        info = pair.get("info") or {}
+        
+        enrichment = {
+            "symbol": base.get("symbol", "???"),
+            "name": base.get("name", "Unknown"),
+            "price_usd": float(pair.get("priceUsd") or 0),
+            "market_cap": pair.get("fdv"),
+            "liquidity_usd": liquidity.get("usd"),
+            "price_change_1h": price_change.get("h1"),
+            "price_change_24h": price_change.get("h24"),
+            "volume_24h": volume.get("h24"),
+            "dex_url": pair.get("url"),
+            "image_url": info.get("imageUrl"),
+            "chain": pair.get("chainId", token.chain),
+            "pair_created_at": pair.get("pairCreatedAt"),
+        }
+        
+        # Cache it
+        self._enrichment_cache[cache_key] = enrichment
+        self._cache_time[cache_key] = time.monotonic()
+        
+        self._apply_enrichment(token, enrichment)
     
     def _apply_enrichment(self, token: DiscoveredToken, data: Dict):
         """Apply enrichment data to token"""
@@ -315,11 +535,9 @@ class ChatFirstScanner:
             
             # Simple sentiment analysis
             text_combined = " ".join(messages).lower()
-            bullish_words = ['bullish', 'moon', 'pump', 'gem', 'alpha', 'lfg', 'buy', 'long', '🚀', '🔥']
-            bearish_words = ['bearish', 'dump', 'rug', 'scam', 'sell', 'short', 'dead', '📉']
-            
-            bull_count = sum(1 for w in bullish_words if w in text_combined)
-            bear_count = sum(1 for w in bearish_words if w in text_combined)
+            word_counts = Counter(SENTIMENT_TOKEN_PATTERN.findall(text_combined))
+            bull_count = sum(word_counts[w] for w in BULLISH_WORDS)
+            bear_count = sum(word_counts[w] for w in BEARISH_WORDS)
             
             chat_sentiment = "bullish" if bull_count > bear_count else "bearish" if bear_count > bull_count else "neutral"
             
@@ -351,23 +569,24 @@ Provide a 2-3 sentence summary of what people are saying about this token. Inclu
 
 Be concise and factual."""
 
-            response = await client.post(
-                "https://api.groq.com/openai/v1/chat/completions",
-                headers={
-                    "Authorization": f"Bearer {GROQ_API_KEY}",
-                    "Content-Type": "application/json",
-                },
-                json={
-                    "model": GROQ_MODEL,
-                    "messages": [{"role": "user", "content": prompt}],
-                    "max_tokens": 200,
-                    "temperature": 0.3,
-                },
-                timeout=15.0,
-            )
+            async with self._semaphore:
+                response = await client.post(
+                    "https://api.groq.com/openai/v1/chat/completions",
+                    headers={
+                        "Authorization": f"Bearer {GROQ_API_KEY}",
+                        "Content-Type": "application/json",
+                    },
+                    content=orjson.dumps({
+                        "model": GROQ_MODEL,
+                        "messages": [{"role": "user", "content": prompt}],
+                        "max_tokens": 200,
+                        "temperature": 0.3,
+                    }),
+                    timeout=15.0,
+                )
             
             if response.status_code == 200:
-                result = response.json()
+                result = orjson.loads(response.content)
                 summary = result.get("choices", [{}])[0].get("message", {}).get("content", "")
                 if summary:
                     token.chat_summary = summary.strip()
@@ -390,6 +609,20 @@ Be concise and factual."""
         
         return token
     
+    @staticmethod
+    def _parse_timestamp(timestamp_str: Optional[str], default: datetime) -> datetime:
+        """Parse an ISO timestamp ('Z' suffix allowed) to a naive datetime"""
+        if not timestamp_str:
+            return default
+        try:
+            # fromisoformat accepts a trailing 'Z' on Python 3.11+
+            timestamp = datetime.fromisoformat(timestamp_str)
+        except (TypeError, ValueError):
+            return default
+        if timestamp.tzinfo:
+            timestamp = timestamp.replace(tzinfo=None)
+        return timestamp
+    
     async def scan_chats(
         self,
         messages: List[Dict[str, Any]],
@@ -408,116 +641,120 @@ Be concise and factual."""
         logger.info("chat_scan_start", message_count=len(messages))
         
         # 1. Extract all token mentions
-        discovered: Dict[str, DiscoveredToken] = {}
+        # Mentions are accumulated column-wise (one row per address) and
+        # DiscoveredToken objects are only built for the tokens returned.
+        row_of: Dict[str, int] = {}  # lowercased address -> row
+        addresses: List[str] = []
+        chains: List[str] = []
+        methods: List[str] = []
+        symbols: List[Optional[str]] = []
+        mention_counts: List[int] = []
+        chat_sets: List[Set[str]] = []
+        message_lists: List[List[Dict]] = []
+        first_seen: List[datetime] = []
+        last_seen: List[datetime] = []
         ticker_mentions: Dict[str, List[Dict]] = defaultdict(list)  # ticker -> messages
         
-        for msg in messages:
+        def add_mention(address: str, chain: str, method: str, record: Dict, symbol: Optional[str] = None):
+            addr_lower = address.lower()
+            timestamp = record["timestamp"]
+            row = row_of.get(addr_lower)
+            
+            if row is None:
+                row_of[addr_lower] = len(addresses)
+                addresses.append(address)
+                chains.append(chain)
+                methods.append(method)
+                symbols.append(symbol)
+                mention_counts.append(1)
+                chat_sets.append({record["source_name"]})
+                message_lists.append([record])
+                first_seen.append(timestamp)
+                last_seen.append(timestamp)
+            else:
+                mention_counts[row] += 1
+                chat_sets[row].add(record["source_name"])
+                message_lists[row].append(record)
+                if timestamp < first_seen[row]:
+                    first_seen[row] = timestamp
+                if timestamp > last_seen[row]:
+                    last_seen[row] = timestamp
+        
+        scan_time = datetime.utcnow()  # fallback for missing/invalid timestamps
+        parsed_timestamps: Dict[str, datetime] = {}
+        
+        # Regex extraction is CPU-bound - run it in a worker thread so the
+        # event loop keeps serving other requests during large scans
+        extracted = await asyncio.to_thread(self._extract_tokens_from_messages, messages)
+        
+        for msg, tokens_in_msg in zip(messages, extracted):
             text = msg.get("text", "")
-            if not text:
+            if not text or not tokens_in_msg:
                 continue
             
             source_name = msg.get("source_name", "Unknown")
             timestamp_str = msg.get("timestamp")
             
-            try:
-                timestamp = datetime.fromisoformat(timestamp_str.replace("Z", "+00:00")) if timestamp_str else datetime.utcnow()
-                if timestamp.tzinfo:
-                    timestamp = timestamp.replace(tzinfo=None)
-            except:
-                timestamp = datetime.utcnow()
+            # Batches repeat timestamps a lot - parse each distinct string once
+            timestamp = parsed_timestamps.get(timestamp_str) if timestamp_str else None
+            if timestamp is None:
+                timestamp = self._parse_timestamp(timestamp_str, scan_time)
+                if timestamp_str:
+                    parsed_timestamps[timestamp_str] = timestamp
             
-            # Extract tokens
-            tokens_in_msg = self._extract_tokens_from_message(text)
+            record = {"text": text, "source_name": source_name, "timestamp": timestamp}
             
             for addr_or_ticker, chain, method in tokens_in_msg:
                 if method == 'ticker':
                     # Collect ticker mentions to resolve later
-                    ticker_mentions[addr_or_ticker].append({
-                        "text": text,
-                        "source_name": source_name,
-                        "timestamp": timestamp,
-                    })
+                    ticker_mentions[addr_or_ticker].append(record)
                 else:
                     # Direct address - add to discovered
-                    addr_lower = addr_or_ticker.lower()
-                    
-                    if addr_lower not in discovered:
-                        discovered[addr_lower] = DiscoveredToken(
-                            address=addr_or_ticker,
-                            chain=chain,
-                            discovery_method=method,
-                            mention_count=1,
-                            chats={source_name},
-                            messages=[{"text": text, "source_name": source_name, "timestamp": timestamp}],
-                            first_seen=timestamp,
-                            last_seen=timestamp,
-                        )
-                    else:
-                        token = discovered[addr_lower]
-                        token.mention_count += 1
-                        token.chats.add(source_name)
-                        token.messages.append({"text": text, "source_name": source_name, "timestamp": timestamp})
-                        if timestamp < token.first_seen:
-                            token.first_seen = timestamp
-                        if timestamp > token.last_seen:
-                            token.last_seen = timestamp
+                    add_mention(addr_or_ticker, chain, method, record)
         
         logger.info("extraction_complete", 
-                    addresses_found=len(discovered),
+                    addresses_found=len(addresses),
                     tickers_found=len(ticker_mentions))
         
-        # 2. Resolve tickers to addresses
-        for ticker, msgs in ticker_mentions.items():
-            resolved = await self._resolve_ticker(ticker)
+        # 2. Resolve tickers to addresses (concurrently, bounded by semaphore)
+        resolutions = await asyncio.gather(
+            *(self._resolve_ticker(ticker) for ticker in ticker_mentions)
+        )
+        for (ticker, msgs), resolved in zip(ticker_mentions.items(), resolutions):
             if resolved:
                 addr, chain = resolved
-                addr_lower = addr.lower()
-                
-                if addr_lower not in discovered:
-                    first_msg = msgs[0]
-                    discovered[addr_lower] = DiscoveredToken(
-                        address=addr,
-                        chain=chain,
-                        discovery_method='ticker',
-                        symbol=ticker,
-                        mention_count=len(msgs),
-                        chats={m["source_name"] for m in msgs},
-                        messages=msgs,
-                        first_seen=min(m["timestamp"] for m in msgs),
-                        last_seen=max(m["timestamp"] for m in msgs),
-                    )
-                else:
-                    token = discovered[addr_lower]
-                    token.mention_count += len(msgs)
-                    token.chats.update(m["source_name"] for m in msgs)
-                    token.messages.extend(msgs)
-                    for m in msgs:
-                        if m["timestamp"] < token.first_seen:
-                            token.first_seen = m["timestamp"]
-                        if m["timestamp"] > token.last_seen:
-                            token.last_seen = m["timestamp"]
-        
-        logger.info("ticker_resolution_complete", total_tokens=len(discovered))
-        
-        # 3. Sort by last_seen (most recent first)
-        tokens_list = list(discovered.values())
-        tokens_list.sort(key=lambda t: t.last_seen or datetime.min, reverse=True)
-        
-        # 4. Limit
-        tokens_list = tokens_list[:limit]
-        
-        # 5. Enrich with market data
-        enriched = []
-        for token in tokens_list:
-            enriched_token = await self._enrich_token(token)
-            enriched.append(enriched_token)
+                for record in msgs:
+                    add_mention(addr, chain, 'ticker', record, symbol=ticker)
+        
+        logger.info("ticker_resolution_complete", total_tokens=len(addresses))
+        
+        # 3. Sort by last_seen (most recent first) and 4. limit - O(N log limit)
+        rows = heapq.nlargest(limit, range(len(addresses)), key=last_seen.__getitem__)
+        
+        # Materialise only the surviving rows
+        tokens_list = [
+            DiscoveredToken(
+                address=addresses[row],
+                chain=chains[row],
+                discovery_method=methods[row],
+                symbol=symbols[row],
+                mention_count=mention_counts[row],
+                chats=chat_sets[row],
+                messages=message_lists[row],
+                first_seen=first_seen[row],
+                last_seen=last_seen[row],
+            )
+            for row in rows
+        ]
+        
+        # 5. Enrich with market data (batched DexScreener lookups)
+        enriched = await self._enrich_batch(tokens_list)
         
         # 6. Generate summaries
-        for token in enriched:
-            await self._generate_summary(token)
+        await asyncio.gather(*(self._generate_summary(token) for token in enriched))
         
         logger.info("scan_complete",
-                    total_discovered=len(discovered),
+                    total_discovered=len(addresses),
                     returned=len(enriched))
         
         return enriched
@@ -7,22 +7,114 @@ Uses LLM to generate concise summaries per chat per token.
 
 import os
 import re
+import sys
+import hashlib
 import httpx
-from typing import Dict, Any, List, Optional
+import orjson
+from typing import Dict, Any, List, Optional, Set, Tuple
 from dataclasses import dataclass, field
 from datetime import datetime, timedelta
 from collections import defaultdict
+from bisect import bisect_right
+from functools import lru_cache
 import asyncio
 import structlog
 
+from app.services.trending.ttl_cache import TTLCache
+
 logger = structlog.get_logger()
 
 # Groq API for LLM summarization
 GROQ_API_KEY = os.getenv("GROQ_API_KEY", "")
 GROQ_API_URL = "https://api.groq.com/openai/v1/chat/completions"
+GROQ_MODEL = "llama-3.1-8b-instant"
+
+# Chats summarized together in one Groq request
+MAX_CHATS_PER_LLM_CALL = 8
+
+# LLM summaries keyed by message content hash (LRU + TTL)
+LLM_CACHE_MAX_ENTRIES = 2048
+LLM_CACHE_TTL_S = 30 * 60
+
+# Per-token analyses kept at most
+SUMMARY_CACHE_MAX_ENTRIES = 1024
+
+# Max concurrent Groq calls (stays under the API rate limit)
+MAX_CONCURRENT_LLM_CALLS = 20
+
+# Words for the per-batch inverted index
+WORD_REGEX = re.compile(r'\w+')
+
+# Joins message texts into the searchable corpus (never part of an address)
+CORPUS_SEPARATOR = "\x00"
+
+
+@lru_cache(maxsize=4096)
+def _token_matcher(address: str, symbol: str, name: str) -> Tuple[Tuple[str, ...], re.Pattern]:
+    """
+    Build the mention matcher for one token, once.
+    
+    A lowercased message mentions the token if it contains the full address
+    or its first/last 8 characters (addresses longer than 12), $SYMBOL,
+    SYMBOL as a word (symbols of 2+ characters) or the name as a word
+    (names of 4+ characters).
+    
+    Returns:
+        (lowercased address substrings, compiled $SYMBOL/SYMBOL/name regex)
+    """
+    address_lower = address.lower()
+    if len(address) > 12:
+        # Any text containing the full address also contains its prefix,
+        # so only the truncated forms need searching
+        prefix, suffix = address_lower[:8], address_lower[-8:]
+        needles = [prefix] if prefix == suffix else [prefix, suffix]
+    else:
+        needles = [address_lower]
+    
+    escaped = re.escape(symbol)
+    parts = [rf'\${escaped}\b']
+    if len(symbol) >= 2:
+        parts.append(rf'\b{escaped}\b')
+    if name and len(name) >= 4:
+        parts.append(rf'\b{re.escape(name)}\b')
+    
+    return tuple(needles), re.compile("|".join(parts), re.IGNORECASE)
+
+
+def _needs_regex_scan(symbol: str, name: str) -> bool:
+    """
+    Whether a token's symbol/name can't be resolved through the word index.
+    
+    A symbol of 2+ word characters matches exactly where its lowercased
+    form is a word of the message (\bSYMBOL\b also covers $SYMBOL), and
+    likewise a one-word name; anything else needs _token_matcher's regex.
+    """
+    symbol_lower = symbol.lower()
+    name_lower = name.lower() if name and len(name) >= 4 else ""
+    symbol_indexed = len(symbol) >= 2 and WORD_REGEX.fullmatch(symbol_lower)
+    name_indexed = not name_lower or WORD_REGEX.fullmatch(name_lower)
+    return not (symbol_indexed and name_indexed)
 
 
 @dataclass
+class MessageIndex:
+    """
+    A batch of messages preprocessed once and shared by every token analyzed.
+    
+    All lists are parallel to `messages`; positions index into them.
+    """
+    messages: List[Dict[str, Any]]
+    texts_lower: List[str]  # "" for messages without text
+    chat_of: List[str]  # source_name per message
+    timestamps: List[Optional[datetime]]  # naive parsed timestamp, None if missing/invalid
+    by_chat: Dict[str, List[int]]  # chat name -> positions, in message order
+    word_positions: Dict[str, List[int]]  # lowercased word -> positions containing it
+    corpus: str  # every texts_lower joined by CORPUS_SEPARATOR
+    corpus_starts: List[int]  # offset of each message's text within corpus
+    pattern_hits: Dict[str, Set[int]] = field(default_factory=dict)  # token regex -> positions, prefilled per batch
+
+
+@dataclass(slots=True, frozen=True)
 class ChatTokenSummary:
     """Summary of what one chat says about a token"""
     chat_name: str
@@ -43,7 +135,7 @@ class ChatTokenSummary:
         }
 
 
-@dataclass
+@dataclass(slots=True, frozen=True)
 class TokenChatAnalysis:
     """Complete analysis of a token across all chats"""
     address: str
@@ -73,16 +165,16 @@ class TokenChatAnalysis:
 class ChatSummarizer:
     """Summarizes Telegram chat discussions about tokens"""
     
-    # Patterns for detecting token mentions
-    SCAN_PATTERNS = [
-        r'pump\.fun/',
-        r'dexscreener\.com/',
-        r'birdeye\.so/',
-        r'raydium\.io/',
-        r'jupiter\.ag/',
-        r'^CA[:\s]',
-        r'^Contract[:\s]',
-    ]
+    # Markers of token scans (bot posts, link shares), matched on lowercased
+    # text with plain substring checks - no regex engine on the hot path
+    SCAN_DOMAINS = (
+        'pump.fun/',
+        'dexscreener.com/',
+        'birdeye.so/',
+        'raydium.io/',
+        'jupiter.ag/',
+    )
+    SCAN_PREFIXES = ('ca', 'contract')  # at message start, followed by ':' or whitespace
     
     BULLISH_WORDS = [
         'bullish', 'moon', 'pump', 'gem', 'alpha', 'lfg', 'wagmi',
@@ -95,81 +187,226 @@ class ChatSummarizer:
         'dead', 'careful', 'risky', 'avoid', 'exit', '📉', '💀',
     ]
     
+    # Split once at class load
+    BULLISH_WORD_SET = frozenset(w for w in BULLISH_WORDS if w.isalnum())
+    BEARISH_WORD_SET = frozenset(w for w in BEARISH_WORDS if w.isalnum())
+    BULLISH_EMOJI = tuple(w for w in BULLISH_WORDS if not w.isalnum())
+    BEARISH_EMOJI = tuple(w for w in BEARISH_WORDS if not w.isalnum())
+    
     def __init__(self):
         self._client: Optional[httpx.AsyncClient] = None
-        self._summary_cache: Dict[str, TokenChatAnalysis] = {}
-        self._cache_time: Dict[str, datetime] = {}
         self.cache_duration = timedelta(minutes=5)
+        self._summary_cache = TTLCache(
+            maxsize=SUMMARY_CACHE_MAX_ENTRIES,
+            ttl=self.cache_duration.total_seconds(),
+        )
+        self._llm_semaphore = asyncio.Semaphore(MAX_CONCURRENT_LLM_CALLS)
+        self._llm_cache = TTLCache(maxsize=LLM_CACHE_MAX_ENTRIES, ttl=LLM_CACHE_TTL_S)
     
     async def _get_client(self) -> httpx.AsyncClient:
         if self._client is None or self._client.is_closed:
-            self._client = httpx.AsyncClient(timeout=60.0)
+            # One pooled HTTP/2 connection set reused by all concurrent summaries
+            self._client = httpx.AsyncClient(
+                timeout=httpx.Timeout(60.0, connect=5.0),
+                transport=httpx.AsyncHTTPTransport(
+                    http2=True,
+                    limits=httpx.Limits(max_connections=64, max_keepalive_connections=32),
+                    retries=2,  # connection-level retries only
+                ),
+            )
         return self._client
     
-    def _message_mentions_token(
+    async def close(self):
+        if self._client:
+            await self._client.aclose()
+            self._client = None
+    
+    def _is_scan_message(self, text_lower: str) -> bool:
+        """Check if a lowercased message is a token scan (bot post, link share)"""
+        if any(domain in text_lower for domain in self.SCAN_DOMAINS):
+            return True
+        for prefix in self.SCAN_PREFIXES:
+            if text_lower.startswith(prefix):
+                following = text_lower[len(prefix):len(prefix) + 1]
+                if following == ':' or following.isspace():
+                    return True
+        return False
+    
+    @staticmethod
+    @lru_cache(maxsize=8192)
+    def _get_sentiment(text_lower: str) -> str:
+        """Determine sentiment of lowercased text (memoized - forwards and bot posts repeat)"""
+        cls = ChatSummarizer
+        words = set(WORD_REGEX.findall(text_lower))
+        bullish = len(words & cls.BULLISH_WORD_SET) + sum(text_lower.count(e) for e in cls.BULLISH_EMOJI)
+        bearish = len(words & cls.BEARISH_WORD_SET) + sum(text_lower.count(e) for e in cls.BEARISH_EMOJI)
+        
+        if bullish > bearish:
+            return "bullish"
+        elif bearish > bullish:
+            return "bearish"
+        return "neutral"
+    
+    @staticmethod
+    def _parse_timestamp(ts_str: Any) -> Optional[datetime]:
+        """Parse an ISO timestamp to a naive datetime, None if missing/invalid"""
+        if not ts_str:
+            return None
+        try:
+            # fromisoformat accepts a trailing "Z" since Python 3.11
+            ts = datetime.fromisoformat(ts_str)
+        except Exception:
+            return None
+        if ts.tzinfo:
+            ts = ts.replace(tzinfo=None)
+        return ts
+    
+    def _build_message_index(self, messages: List[Dict[str, Any]]) -> MessageIndex:
+        """Lowercase, tokenize, parse timestamps and group every message once"""
+        texts_lower: List[str] = []
+        chat_of: List[str] = []
+        timestamps: List[Optional[datetime]] = []
+        parsed_ts: Dict[Any, Optional[datetime]] = {}  # messages often share timestamps
+        by_chat: Dict[str, List[int]] = {}
+        word_positions: Dict[str, List[int]] = defaultdict(list)
+        
+        for i, msg in enumerate(messages):
+            source_name = msg.get("source_name", "Unknown")
+            if type(source_name) is str:
+                # Chat names repeat across thousands of messages - share one object
+                source_name = sys.intern(source_name)
+            text_lower = (msg.get("text") or "").lower()
+            
+            texts_lower.append(text_lower)
+            chat_of.append(source_name)
+            
+            ts_str = msg.get("timestamp")
+            try:
+                ts = parsed_ts[ts_str]
+            except KeyError:
+                ts = parsed_ts[ts_str] = self._parse_timestamp(ts_str)
+            except TypeError:  # unhashable value
+                ts = self._parse_timestamp(ts_str)
+            timestamps.append(ts)
+            
+            chat_positions = by_chat.get(source_name)
+            if chat_positions is None:
+                chat_positions = by_chat[source_name] = []
+            chat_positions.append(i)
+            for word in set(WORD_REGEX.findall(text_lower)):
+                word_positions[word].append(i)
+        
+        corpus_starts: List[int] = []
+        offset = 0
+        for text_lower in texts_lower:
+            corpus_starts.append(offset)
+            offset += len(text_lower) + len(CORPUS_SEPARATOR)
+        
+        return MessageIndex(
+            messages=messages,
+            texts_lower=texts_lower,
+            chat_of=chat_of,
+            timestamps=timestamps,
+            by_chat=by_chat,
+            word_positions=word_positions,
+            corpus=CORPUS_SEPARATOR.join(texts_lower),
+            corpus_starts=corpus_starts,
+        )
+    
+    def _find_mentions(
         self,
-        text: str,
+        index: MessageIndex,
         address: str,
         symbol: str,
         name: str = "",
-    ) -> bool:
-        """Check if message mentions a token"""
-        text_lower = text.lower()
+    ) -> Set[int]:
+        """
+        Positions of messages that mention a token.
         
-        # Check address
-        if address.lower() in text_lower:
-            return True
+        Rules are those of _token_matcher; symbol and name are looked up in
+        the word index instead of searched per message where possible.
+        """
+        address_needles, mention_regex = _token_matcher(address, symbol, name)
         
-        # Check truncated address
-        if len(address) > 12:
-            if address[:8].lower() in text_lower or address[-8:].lower() in text_lower:
-                return True
+        # Full/truncated address can appear inside URLs - substring scan
+        mentioned = self._find_substring(index, address_needles)
         
-        # Check $SYMBOL
-        if re.search(rf'\${re.escape(symbol)}\b', text, re.IGNORECASE):
-            return True
+        if not _needs_regex_scan(symbol, name):
+            # \bSYMBOL\b (which also covers $SYMBOL) and \bNAME\b are whole words
+            mentioned.update(index.word_positions.get(symbol.lower(), ()))
+            if name and len(name) >= 4:
+                mentioned.update(index.word_positions.get(name.lower(), ()))
+        else:
+            # Short or non-word symbol / multi-word name - regex over the corpus
+            hits = index.pattern_hits.get(mention_regex.pattern)
+            if hits is None:
+                hits = self._find_pattern(index, mention_regex)
+            mentioned.update(hits)
         
-        # Check SYMBOL as word
-        if len(symbol) >= 2:
-            if re.search(rf'\b{re.escape(symbol)}\b', text, re.IGNORECASE):
-                return True
+        return mentioned
+    
+    @staticmethod
+    def _find_substring(index: MessageIndex, needles: Tuple[str, ...]) -> Set[int]:
+        """
+        Positions of messages containing any of `needles`.
         
-        # Check name
-        if name and len(name) >= 4:
-            if re.search(rf'\b{re.escape(name)}\b', text, re.IGNORECASE):
-                return True
+        Searches the whole joined corpus with str.find instead of testing
+        every message, jumping to the next message after each hit.
+        """
+        if not all(needles):
+            return {i for i, text_lower in enumerate(index.texts_lower) if text_lower}
         
-        return False
+        corpus = index.corpus
+        starts = index.corpus_starts
+        found: Set[int] = set()
+        for needle in needles:
+            pos = corpus.find(needle)
+            while pos != -1:
+                i = bisect_right(starts, pos) - 1
+                found.add(i)
+                if i + 1 >= len(starts):
+                    break
+                pos = corpus.find(needle, starts[i + 1])
+        return found
     
-    def _is_scan_message(self, text: str) -> bool:
-        """Check if message is a token scan (bot post, link share)"""
-        for pattern in self.SCAN_PATTERNS:
-            if re.search(pattern, text, re.IGNORECASE):
-                return True
-        return False
+    @staticmethod
+    def _find_pattern(index: MessageIndex, pattern: re.Pattern) -> Set[int]:
+        """Positions of messages matching `pattern`, in a single pass over the corpus"""
+        corpus = index.corpus
+        starts = index.corpus_starts
+        found: Set[int] = set()
+        match = pattern.search(corpus)
+        while match:
+            i = bisect_right(starts, match.start()) - 1
+            found.add(i)
+            if i + 1 >= len(starts):
+                break
+            match = pattern.search(corpus, starts[i + 1])
+        return found
     
-    def _get_sentiment(self, text: str) -> str:
-        """Determine sentiment of text"""
-        text_lower = text.lower()
-        bullish = sum(1 for w in self.BULLISH_WORDS if w in text_lower)
-        bearish = sum(1 for w in self.BEARISH_WORDS if w in text_lower)
+    def _prefill_pattern_hits(self, index: MessageIndex, patterns: List[re.Pattern]):
+        """
+        Match many token regexes with one combined pass over the corpus.
         
-        if bullish > bearish:
-            return "bullish"
-        elif bearish > bullish:
-            return "bearish"
-        return "neutral"
+        The combined alternation only finds candidate messages (any token
+        matches); each token's own regex then runs on just those candidates,
+        so overlapping matches between tokens are never lost.
+        """
+        patterns = list({p.pattern: p for p in patterns}.values())
+        if len(patterns) < 2:
+            return
+        
+        combined = re.compile("|".join(f"(?:{p.pattern})" for p in patterns), re.IGNORECASE)
+        candidates = sorted(self._find_pattern(index, combined))
+        texts_lower = index.texts_lower
+        for p in patterns:
+            index.pattern_hits[p.pattern] = {i for i in candidates if p.search(texts_lower[i])}
     
-    def _group_messages_by_chat(
-        self,
-        messages: List[Dict[str, Any]],
-    ) -> Dict[str, List[Dict[str, Any]]]:
-        """Group messages by chat source"""
-        grouped = defaultdict(list)
-        for msg in messages:
-            source_name = msg.get("source_name", "Unknown")
-            grouped[source_name].append(msg)
-        return dict(grouped)
+    @staticmethod
+    def _llm_cache_key(messages: List[str], token_symbol: str, chat_name: str) -> str:
+        """Hash of the chat, token and messages an LLM summary is built from"""
+        content = "\n".join(sorted(messages[:20])) + "|" + token_symbol + "|" + chat_name
+        return hashlib.blake2b(content.encode(), digest_size=16).hexdigest()
     
     async def _summarize_with_llm(
         self,
@@ -182,6 +419,11 @@ class ChatSummarizer:
             # Fallback without LLM
             return self._simple_summarize(messages, token_symbol)
         
+        cache_key = self._llm_cache_key(messages, token_symbol, chat_name)
+        cached = self._llm_cache.get(cache_key)
+        if cached is not None:
+            return cached
+        
         try:
             client = await self._get_client()
             
@@ -199,29 +441,151 @@ Messages:
 
 Summary:"""
             
-            response = await client.post(
-                GROQ_API_URL,
-                headers={
-                    "Authorization": f"Bearer {GROQ_API_KEY}",
-                    "Content-Type": "application/json",
-                },
-                json={
-                    "model": "llama-3.1-8b-instant",
-                    "messages": [{"role": "user", "content": prompt}],
-                    "max_tokens": 100,
-                    "temperature": 0.3,
-                },
-            )
+            async with self._llm_semaphore:
+                response = await client.post(
+                    GROQ_API_URL,
+                    headers={
+                        "Authorization": f"Bearer {GROQ_API_KEY}",
+                        "Content-Type": "application/json",
+                    },
+                    content=orjson.dumps({
+                        "model": GROQ_MODEL,
+                        "messages": [{"role": "user", "content": prompt}],
+                        "max_tokens": 100,
+                        "temperature": 0.3,
+                    }),
+                )
             
             if response.status_code == 200:
-                data = response.json()
-                return data["choices"][0]["message"]["content"].strip()
+                data = orjson.loads(response.content)
+                summary = data["choices"][0]["message"]["content"].strip()
+                self._llm_cache.set(cache_key, summary)
+                return summary
             
         except Exception as e:
             logger.warning("llm_summarize_failed", error=str(e))
         
         return self._simple_summarize(messages, token_symbol)
     
+    async def _summarize_chats_batch(
+        self,
+        items: List[Tuple[str, List[str]]],
+        token_symbol: str,
+    ) -> List[str]:
+        """
+        Summarize several chats' discussion of a token.
+        
+        Chats are packed MAX_CHATS_PER_LLM_CALL per Groq request instead of
+        one request each.
+        
+        Args:
+            items: (chat_name, discussion messages) per chat
+        
+        Returns:
+            One summary per item, in order
+        """
+        if not GROQ_API_KEY:
+            return [self._simple_summarize(messages, token_symbol) for _, messages in items]
+        
+        # Only chats whose messages haven't been summarized recently go to the LLM
+        summaries: List[Optional[str]] = []
+        misses: List[int] = []
+        for i, (chat_name, messages) in enumerate(items):
+            cached = self._llm_cache.get(self._llm_cache_key(messages, token_symbol, chat_name))
+            summaries.append(cached)
+            if cached is None:
+                misses.append(i)
+        
+        groups = [
+            misses[i:i + MAX_CHATS_PER_LLM_CALL]
+            for i in range(0, len(misses), MAX_CHATS_PER_LLM_CALL)
+        ]
+        results = await asyncio.gather(*(
+            self._summarize_chat_group([items[j] for j in group], token_symbol)
+            for group in groups
+        ))
+        for group, group_summaries in zip(groups, results):
+            for j, summary in zip(group, group_summaries):
+                summaries[j] = summary
+        return summaries
+    
+    async def _summarize_chat_group(
+        self,
+        items: List[Tuple[str, List[str]]],
+        token_symbol: str,
+    ) -> List[str]:
+        """One Groq request for a group of chats, falling back to per-chat calls on a malformed reply"""
+        if len(items) == 1:
+            chat_name, messages = items[0]
+            return [await self._summarize_with_llm(messages, token_symbol, chat_name)]
+        
+        try:
+            client = await self._get_client()
+            
+            sections = []
+            for n, (chat_name, messages) in enumerate(items, 1):
+                combined = "\n".join(messages[:20])  # Limit to 20 messages per chat
+                sections.append(f'Chat {n}: "{chat_name}"\n{combined}')
+            chats_text = "\n\n".join(sections)
+            
+            prompt = f"""Summarize what each of these {len(items)} Telegram chats is saying about the token ${token_symbol}.
+For each chat be concise (1-2 sentences). Focus on:
+- Overall sentiment (bullish/bearish/neutral)
+- Key opinions or insights
+- Any warnings or alpha
+
+{chats_text}
+
+Respond with JSON: {{"summaries": ["<chat 1 summary>", "<chat 2 summary>", ...]}} with exactly {len(items)} entries, in chat order."""
+            
+            async with self._llm_semaphore:
+                response = await client.post(
+                    GROQ_API_URL,
+                    headers={
+                        "Authorization": f"Bearer {GROQ_API_KEY}",
+                        "Content-Type": "application/json",
+                    },
+                    content=orjson.dumps({
+                        "model": GROQ_MODEL,
+                        "messages": [{"role": "user", "content": prompt}],
+                        "max_tokens": 100 * len(items),
+                        "temperature": 0.3,
+                        "response_format": {"type": "json_object"},
+                    }),
+                )
+            
+        except Exception as e:
+            logger.warning("llm_batch_summarize_failed", chats=len(items), error=str(e))
+            return [self._simple_summarize(messages, token_symbol) for _, messages in items]
+        
+        if response.status_code != 200:
+            # Rate limited or down - more requests would only make it worse
+            logger.warning("llm_batch_summarize_failed", chats=len(items), status=response.status_code)
+            return [self._simple_summarize(messages, token_symbol) for _, messages in items]
+        
+        try:
+            data = orjson.loads(response.content)
+            content = orjson.loads(data["choices"][0]["message"]["content"])
+            summaries = content.get("summaries") if isinstance(content, dict) else None
+            if (
+                isinstance(summaries, list)
+                and len(summaries) == len(items)
+                and all(isinstance(s, str) and s.strip() for s in summaries)
+            ):
+                summaries = [s.strip() for s in summaries]
+                for (chat_name, messages), summary in zip(items, summaries):
+                    self._llm_cache.set(self._llm_cache_key(messages, token_symbol, chat_name), summary)
+                return summaries
+            logger.warning("llm_batch_summary_invalid", chats=len(items))
+        except Exception as e:
+            logger.warning("llm_batch_summary_invalid", chats=len(items), error=str(e))
+        
+        # The model answered but not in the expected shape - ask per chat
+        return list(await asyncio.gather(*(
+            self._summarize_with_llm(messages, token_symbol, chat_name)
+            for chat_name, messages in items
+        )))
+    
     def _simple_summarize(self, messages: List[str], token_symbol: str) -> str:
         """Simple rule-based summary without LLM"""
         if not messages:
@@ -232,7 +596,7 @@ Summary:"""
         bearish = 0
         
         for msg in messages:
-            sentiment = self._get_sentiment(msg)
+            sentiment = self._get_sentiment(msg.lower())
             if sentiment == "bullish":
                 bullish += 1
             elif sentiment == "bearish":
@@ -254,76 +618,90 @@ Summary:"""
         token_symbol: str,
         token_name: str,
         chain: str,
+        index: Optional[MessageIndex] = None,
     ) -> TokenChatAnalysis:
         """
         Analyze what all chats are saying about a specific token.
         
+        Args:
+            index: Prebuilt index of `messages` (shared when analyzing
+                many tokens over the same messages)
+        
         Returns:
             TokenChatAnalysis with per-chat summaries and overall consensus
         """
         # Check cache
         cache_key = f"{chain}:{token_address}"
-        if cache_key in self._summary_cache:
-            if datetime.utcnow() - self._cache_time.get(cache_key, datetime.min) < self.cache_duration:
-                return self._summary_cache[cache_key]
+        cached = self._summary_cache.get(cache_key)
+        if cached is not None:
+            return cached
         
-        # Group messages by chat
-        grouped = self._group_messages_by_chat(messages)
+        # Index messages (lowercase, tokenize, group by chat)
+        if index is None:
+            index = self._build_message_index(messages)
         
-        chat_summaries = []
+        # Find messages mentioning this token, bucketed by chat
+        mentions_by_chat: Dict[str, List[int]] = defaultdict(list)
+        for i in sorted(self._find_mentions(index, token_address, token_symbol, token_name)):
+            mentions_by_chat[index.chat_of[i]].append(i)
+        
+        chat_mentions = []  # (chat_name, chat_id, token_messages, discussion_messages, last_mention, sentiment)
         total_mentions = 0
         overall_bullish = 0
         overall_bearish = 0
         
-        for chat_name, chat_messages in grouped.items():
-            # Find messages mentioning this token
+        for chat_name, chat_positions in index.by_chat.items():
+            # Skip if no mentions in this chat
+            positions = mentions_by_chat.get(chat_name)
+            if not positions:
+                continue
+            
             token_messages = []
             discussion_messages = []  # Non-scan messages
+            discussion_lower = []  # Same messages, lowercased
             last_mention = None
             
-            for msg in chat_messages:
-                text = msg.get("text", "")
-                if not text:
-                    continue
+            for i in positions:
+                msg = index.messages[i]
+                text = msg["text"]
+                token_messages.append(msg)
+                total_mentions += 1
                 
-                if self._message_mentions_token(text, token_address, token_symbol, token_name):
-                    token_messages.append(msg)
-                    total_mentions += 1
-                    
-                    # Track last mention time
-                    ts_str = msg.get("timestamp")
-                    if ts_str:
-                        try:
-                            ts = datetime.fromisoformat(ts_str.replace("Z", "+00:00"))
-                            if ts.tzinfo:
-                                ts = ts.replace(tzinfo=None)
-                            if last_mention is None or ts > last_mention:
-                                last_mention = ts
-                        except:
-                            pass
-                    
-                    # Separate scans from discussions
-                    if not self._is_scan_message(text):
-                        discussion_messages.append(text)
+                # Track last mention time
+                ts = index.timestamps[i]
+                if ts is not None and (last_mention is None or ts > last_mention):
+                    last_mention = ts
+                
+                # Separate scans from discussions
+                if not self._is_scan_message(index.texts_lower[i]):
+                    discussion_messages.append(text)
+                    discussion_lower.append(index.texts_lower[i])
             
-            # Skip if no mentions in this chat
-            if not token_messages:
-                continue
+            # Determine sentiment
+            sentiment = self._get_sentiment(" ".join(discussion_lower)) if discussion_lower else "neutral"
             
-            # Generate summary for this chat
+            chat_id = index.messages[chat_positions[0]].get("source_id", "")
+            chat_mentions.append((chat_name, chat_id, token_messages, discussion_messages, last_mention, sentiment))
+        
+        # Summarize all chats with discussion (batched LLM requests)
+        llm_summaries = await self._summarize_chats_batch(
+            [
+                (chat_name, discussion_messages)
+                for chat_name, _, _, discussion_messages, _, _ in chat_mentions
+                if discussion_messages
+            ],
+            token_symbol,
+        )
+        llm_summaries_iter = iter(llm_summaries)
+        
+        chat_summaries = []
+        for chat_name, chat_id, token_messages, discussion_messages, last_mention, sentiment in chat_mentions:
+            # Summary for this chat
             if discussion_messages:
-                summary = await self._summarize_with_llm(
-                    discussion_messages,
-                    token_symbol,
-                    chat_name,
-                )
+                summary = next(llm_summaries_iter)
             else:
                 summary = f"Token ${token_symbol} was scanned but no discussion yet."
             
-            # Determine sentiment
-            all_text = " ".join(discussion_messages)
-            sentiment = self._get_sentiment(all_text) if discussion_messages else "neutral"
-            
             if sentiment == "bullish":
                 overall_bullish += 1
             elif sentiment == "bearish":
@@ -331,7 +709,7 @@ Summary:"""
             
             chat_summaries.append(ChatTokenSummary(
                 chat_name=chat_name,
-                chat_id=chat_messages[0].get("source_id", "") if chat_messages else "",
+                chat_id=chat_id,
                 summary=summary,
                 sentiment=sentiment,
                 mention_count=len(token_messages),
@@ -377,8 +755,7 @@ Summary:"""
         )
         
         # Cache
-        self._summary_cache[cache_key] = analysis
-        self._cache_time[cache_key] = datetime.utcnow()
+        self._summary_cache.set(cache_key, analysis)
         
         return analysis
     
@@ -393,28 +770,35 @@ Summary:"""
         Returns:
             Dict mapping token address to TokenChatAnalysis
         """
-        results = {}
+        # Matchers and sentiment are memoized per batch - bound memory across calls
+        _token_matcher.cache_clear()
+        self._get_sentiment.cache_clear()
         
-        for token in tokens:
-            address = token.get("address", "")
-            symbol = token.get("symbol", "")
-            name = token.get("name", "")
-            chain = token.get("chain", "solana")
-            
-            if not address:
-                continue
-            
-            analysis = await self.analyze_token_across_chats(
+        # Index once, shared by every token
+        index = self._build_message_index(messages)
+        
+        tokens = [token for token in tokens if token.get("address")]
+        
+        # Tokens the word index can't resolve share one regex pass
+        self._prefill_pattern_hits(index, [
+            _token_matcher(token["address"], token.get("symbol", ""), token.get("name", ""))[1]
+            for token in tokens
+            if _needs_regex_scan(token.get("symbol", ""), token.get("name", ""))
+        ])
+        
+        analyses = await asyncio.gather(*(
+            self.analyze_token_across_chats(
                 messages=messages,
-                token_address=address,
-                token_symbol=symbol,
-                token_name=name,
-                chain=chain,
+                token_address=token["address"],
+                token_symbol=token.get("symbol", ""),
+                token_name=token.get("name", ""),
+                chain=token.get("chain", "solana"),
+                index=index,
             )
-            
-            results[address] = analysis
+            for token in tokens
+        ))
         
-        return results
+        return {token["address"]: analysis for token, analysis in zip(tokens, analyses)}
 
 
 # Singleton
@@ -12,22 +12,64 @@ in the messages AROUND that post, not just in the post itself.
 """
 
 import re
+import sys
+import asyncio
+import heapq
 import httpx
+import orjson
 from typing import Dict, Any, List, Optional, Set, Tuple
 from dataclasses import dataclass, field
 from datetime import datetime, timedelta
 from collections import defaultdict
+from bisect import bisect_left, bisect_right
 import structlog
 import os
 
+from app.core.redis import get_redis
+from app.services.trending.ttl_cache import TTLCache
+
 logger = structlog.get_logger()
 
 GROQ_API_KEY = os.getenv("GROQ_API_KEY", "")
 GROQ_MODEL = "llama-3.1-8b-instant"
 
+# Max concurrent Groq calls (stays under the API rate limit)
+MAX_CONCURRENT_LLM_CALLS = 10
+
+# Tokens summarized together in one Groq request
+SUMMARY_BATCH_SIZE = 5
+
+# DexScreener accepts up to 30 comma-separated addresses per token lookup,
+# and returns at most 30 pairs per response
+DEXSCREENER_BATCH_SIZE = 30
+DEXSCREENER_MAX_PAIRS = 30
+
+# DexScreener results kept per address
+DEX_CACHE_MAX_ENTRIES = 4096
+DEX_CACHE_TTL_S = 5 * 60
+
+# Addresses DexScreener doesn't know (spam/dead tokens) - rechecked far less
+# often, and persisted in Redis so restarts don't re-query them
+DEX_MISS_CACHE_MAX_ENTRIES = 32768
+DEX_MISS_CACHE_TTL_S = 60 * 60
+DEX_MISS_REDIS_PREFIX = "contextual_scanner:dex_miss:"
+
+# Token extraction per message, reused while cached messages recur across scans
+TOKEN_SCAN_CACHE_MAX_ENTRIES = 65536
+TOKEN_SCAN_CACHE_TTL_S = 60 * 60
+
 # Token detection patterns
 SOLANA_ADDR = r'[1-9A-HJ-NP-Za-km-z]{32,44}'
 EVM_ADDR = r'0x[a-fA-F0-9]{40}'
+SOLANA_ADDR_REGEX = re.compile(SOLANA_ADDR)
+EVM_ADDR_REGEX = re.compile(EVM_ADDR)
+
+# Every address pattern needs at least 32 consecutive alphanumerics
+MIN_ADDRESS_LEN = 32
+ADDRESS_RUN_REGEX = re.compile(r'[0-9A-Za-z]{32}')
+
+# A raw Solana match next to one of these is a transaction signature, not a token
+TX_MARKER_REGEX = re.compile(r'tx:|transaction:|sig:', re.IGNORECASE)
 
 TOKEN_URL_PATTERNS = [
     (r'pump\.fun/(?:coin/)?([1-9A-HJ-NP-Za-km-z]{32,44})', 'solana'),
@@ -38,6 +80,46 @@ TOKEN_URL_PATTERNS = [
     (r'photon-sol\.tinyastro\.io/[^/]+/([1-9A-HJ-NP-Za-km-z]{32,44})', 'solana'),
 ]
 
+# All URL patterns in one scan. Each pattern has exactly one capture group,
+# so match.lastindex - 1 indexes back into TOKEN_URL_PATTERNS (list order
+# is the priority order).
+TOKEN_URL_REGEX = re.compile(
+    '|'.join(f'(?:{pattern})' for pattern, _ in TOKEN_URL_PATTERNS),
+    re.IGNORECASE,
+)
+TOKEN_URL_CHAINS = tuple(chain for _, chain in TOKEN_URL_PATTERNS)
+
+# Message cleanup
+URL_REGEX = re.compile(r'https?://\S+')
+
+# Automated bot posts (matched at message start)
+BOT_MESSAGE_REGEXES = [
+    re.compile(r'^CA[:\s]'),
+    re.compile(r'^Contract[:\s]'),
+    re.compile(r'^\d+\.\d+[KMB]?\s*\|\s*\d+'),  # Price | holders format
+    re.compile(r'^🔫|^🎯|^📊'),  # Common bot emojis at start
+]
+
+# Markdown stripped from LLM summaries
+MARKDOWN_EMPHASIS_REGEX = re.compile(r'\*\*([^*]+)\*\*|\*([^*]+)\*')  # **bold** / *italic*
+MARKDOWN_LINE_PREFIX_REGEX = re.compile(  # Headers, numbered lists, bullet points
+    r'^(?:#+\s*)?(?:\d+\.\s*)?(?:[-•]\s*)?', re.MULTILINE
+)
+WHITESPACE_REGEX = re.compile(r'\s+')  # Joins lines and normalizes spaces
+
+# Sentiment keywords in an LLM summary, checked in priority order
+SUMMARY_SENTIMENT_WORDS = {
+    'bullish': 'bullish', 'optimistic': 'bullish', 'positive': 'bullish',
+    'bearish': 'bearish', 'cautious': 'bearish', 'warning': 'bearish', 'scam': 'bearish',
+    'mixed': 'mixed',
+}
+SUMMARY_SENTIMENT_PRIORITY = ('bullish', 'bearish', 'mixed')
+SUMMARY_SENTIMENT_REGEX = re.compile('|'.join(SUMMARY_SENTIMENT_WORDS), re.IGNORECASE)
+
+
+def _emphasis_text(match: re.Match) -> str:
+    return match.group(1) or match.group(2)
+
 # Skip these common addresses
 SKIP_ADDRESSES = {
     'So11111111111111111111111111111111111111112',  # SOL
@@ -90,48 +172,120 @@ class ContextualScanner:
     
     def __init__(self):
         self._client: Optional[httpx.AsyncClient] = None
-        self._dex_cache: Dict[str, Dict] = {}
-        self._cache_time: Dict[str, datetime] = {}
+        self._dex_cache = TTLCache(maxsize=DEX_CACHE_MAX_ENTRIES, ttl=DEX_CACHE_TTL_S)
+        self._dex_misses = TTLCache(maxsize=DEX_MISS_CACHE_MAX_ENTRIES, ttl=DEX_MISS_CACHE_TTL_S)
+        # (source_id, message_id) -> (text, extracted token), only touched on the event loop
+        self._token_scans = TTLCache(maxsize=TOKEN_SCAN_CACHE_MAX_ENTRIES, ttl=TOKEN_SCAN_CACHE_TTL_S)
+        self._llm_semaphore = asyncio.Semaphore(MAX_CONCURRENT_LLM_CALLS)
     
     async def _get_client(self) -> httpx.AsyncClient:
         if self._client is None or self._client.is_closed:
-            self._client = httpx.AsyncClient(timeout=30.0)
+            # One pooled HTTP/2 connection set shared by DexScreener and Groq fan-out
+            self._client = httpx.AsyncClient(
+                timeout=httpx.Timeout(30.0, connect=5.0),
+                transport=httpx.AsyncHTTPTransport(
+                    http2=True,
+                    limits=httpx.Limits(max_connections=100, max_keepalive_connections=50),
+                    retries=2,  # connection-level retries only
+                ),
+            )
         return self._client
     
+    async def close(self):
+        if self._client:
+            await self._client.aclose()
+            self._client = None
+    
     def _extract_token_from_message(self, text: str) -> Optional[Tuple[str, str]]:
         """Extract token address from a message. Returns (address, chain) or None."""
-        # Try URL patterns first (most reliable)
-        for pattern, chain in TOKEN_URL_PATTERNS:
-            match = re.search(pattern, text, re.IGNORECASE)
-            if match:
-                addr = match.group(1)
-                if addr not in SKIP_ADDRESSES:
-                    return (addr, chain)
+        # Most messages have no address at all - skip the pattern scans
+        if len(text) < MIN_ADDRESS_LEN or not ADDRESS_RUN_REGEX.search(text):
+            return None
+        
+        # Try URL patterns first (most reliable) - earliest-listed pattern wins
+        best_index = None
+        best_addr = None
+        seen_patterns = set()
+        for match in TOKEN_URL_REGEX.finditer(text):
+            pattern_index = match.lastindex
+            if pattern_index in seen_patterns:
+                continue  # Only a pattern's first match counts
+            seen_patterns.add(pattern_index)
+            
+            addr = match.group(pattern_index)
+            if addr not in SKIP_ADDRESSES and (best_index is None or pattern_index < best_index):
+                best_index = pattern_index
+                best_addr = addr
+                if pattern_index == 1:
+                    break
+        if best_addr:
+            return (best_addr, TOKEN_URL_CHAINS[best_index - 1])
         
         # Try raw Solana address
-        match = re.search(SOLANA_ADDR, text)
+        match = SOLANA_ADDR_REGEX.search(text)
         if match:
             addr = match.group(0)
             if addr not in SKIP_ADDRESSES and len(addr) >= 32:
                 # Skip if looks like transaction
-                if not any(x in text.lower() for x in ['tx:', 'transaction:', 'sig:']):
+                if not TX_MARKER_REGEX.search(text):
                     return (addr, 'solana')
         
         # Try EVM address
-        match = re.search(EVM_ADDR, text)
+        match = EVM_ADDR_REGEX.search(text)
         if match:
             return (match.group(0), 'ethereum')
         
         return None
     
+    def _extract_tokens_from_texts(self, texts: List[str]) -> List[Optional[Tuple[str, str]]]:
+        """Run _extract_token_from_message over a batch of texts"""
+        return [self._extract_token_from_message(text) for text in texts]
+    
+    async def _extract_tokens_from_messages(
+        self,
+        messages: List[Dict],
+    ) -> List[Optional[Tuple[str, str]]]:
+        """Extract the token (address, chain) from each message, None where there is none"""
+        extracted: List[Optional[Tuple[str, str]]] = [None] * len(messages)
+        to_scan = []  # (position, memo key, text)
+        for i, msg in enumerate(messages):
+            text = msg.get("text", "")
+            if not text:
+                continue
+            
+            # Messages come from the shared message cache and recur across
+            # scans - reuse the extraction while the text is unchanged
+            key = (msg.get("source_id"), msg.get("message_id"))
+            scanned = self._token_scans.get(key)
+            if scanned is not None and scanned[0] == text:
+                extracted[i] = scanned[1]
+            else:
+                to_scan.append((i, key, text))
+        
+        if to_scan:
+            # Regex extraction is CPU-bound - run it in a worker thread so the
+            # event loop keeps serving other requests. The thread only sees the
+            # texts; the memo is updated back here on the event loop.
+            results = await asyncio.to_thread(
+                self._extract_tokens_from_texts, [text for _, _, text in to_scan]
+            )
+            for (i, key, text), token_info in zip(to_scan, results):
+                extracted[i] = token_info
+                if key[1] is not None:
+                    self._token_scans.set(key, (text, token_info))
+        
+        return extracted
+    
     async def _get_dexscreener_data(self, address: str) -> Optional[Dict]:
         """Fetch token data from DexScreener. Returns None if not found."""
         cache_key = address.lower()
         
         # Check cache
-        if cache_key in self._dex_cache:
-            if datetime.utcnow() - self._cache_time.get(cache_key, datetime.min) < timedelta(minutes=5):
-                return self._dex_cache[cache_key]
+        cached = self._dex_cache.get(cache_key)
+        if cached is not None:
+            return cached
+        if self._dex_misses.get(cache_key):
+            return None
         
         try:
             client = await self._get_client()
@@ -139,49 +293,207 @@ class ContextualScanner:
                 f"https://api.dexscreener.com/latest/dex/tokens/{address}"
             )
             
-            if response.status_code == 200:
-                data = response.json()
-                pairs = data.get("pairs", [])
+            if response.status_code != 200:
+                # Rate limits and outages say nothing about the token - don't cache them
+                logger.warning("dexscreener_fetch_failed", address=address, status=response.status_code)
+                return None
+            
+            data = orjson.loads(response.content)
+            pairs = data.get("pairs") or []
+            
+            if pairs:
+                result = self._parse_dex_pairs(pairs, cache_key)
                 
-                if pairs:
-                    # Get highest liquidity pair
-                    pairs.sort(key=lambda x: x.get("liquidity", {}).get("usd", 0) or 0, reverse=True)
-                    pair = pairs[0]
-                    
-                    base = pair.get("baseToken", {})
-                    if base.get("address", "").lower() != address.lower():
-                        base = pair.get("quoteToken", {})
-                    
-                    result = {
-                        "symbol": base.get("symbol", ""),
-                        "name": base.get("name", ""),
-                        "price_usd": float(pair.get("priceUsd") or 0),
-                        "market_cap": pair.get("fdv"),
-                        "liquidity_usd": pair.get("liquidity", {}).get("usd"),
-                        "price_change_1h": pair.get("priceChange", {}).get("h1"),
-                        "price_change_24h": pair.get("priceChange", {}).get("h24"),
-                        "volume_24h": pair.get("volume", {}).get("h24"),
-                        "dex_url": pair.get("url", ""),
-                        "image_url": pair.get("info", {}).get("imageUrl"),
-                        "chain": pair.get("chainId", "solana"),
-                    }
-                    
-                    self._dex_cache[cache_key] = result
-                    self._cache_time[cache_key] = datetime.utcnow()
-                    return result
+                self._dex_cache.set(cache_key, result)
+                return result
             
             # Cache negative result
-            self._dex_cache[cache_key] = None
-            self._cache_time[cache_key] = datetime.utcnow()
+            await self._record_dex_misses([cache_key])
             return None
             
         except Exception as e:
             logger.warning("dexscreener_fetch_failed", address=address, error=str(e))
             return None
     
+    async def _get_persisted_misses(self, cache_keys: List[str]) -> Set[str]:
+        """Addresses recorded in Redis as unknown to DexScreener (one round trip)"""
+        try:
+            redis = await get_redis()
+            values = await redis.mget([f"{DEX_MISS_REDIS_PREFIX}{key}" for key in cache_keys])
+            return {key for key, value in zip(cache_keys, values) if value}
+        except Exception as e:
+            logger.debug("dex_miss_cache_read_failed", count=len(cache_keys), error=str(e))
+            return set()
+    
+    async def _record_dex_misses(self, cache_keys: List[str]):
+        """Remember addresses DexScreener doesn't know, in memory and in Redis"""
+        for key in cache_keys:
+            self._dex_misses.set(key, True)
+        try:
+            redis = await get_redis()
+            async with redis.pipeline(transaction=False) as pipe:
+                for key in cache_keys:
+                    pipe.setex(f"{DEX_MISS_REDIS_PREFIX}{key}", DEX_MISS_CACHE_TTL_S, "1")
+                await pipe.execute()
+        except Exception as e:
+            logger.debug("dex_miss_cache_write_failed", count=len(cache_keys), error=str(e))
+    
+    def _build_chat_index(
+        self,
+        messages: List[Dict],
+    ) -> Dict[str, Tuple[List[datetime], List[Dict]]]:
+        """
+        Group messages by chat, sorted by time, so context windows can be sliced.
+        
+        Returns:
+            chat name -> (sorted message times, {"text", "time"} context
+            entries in the same order, built once per message; summaries
+            add the cleaned text as "clean" the first time it's needed)
+        """
+        by_chat: Dict[str, List[Dict]] = defaultdict(list)
+        for msg in messages:
+            if msg.get("_parsed_time"):
+                by_chat[msg.get("source_name")].append(msg)
+        
+        chat_index = {}
+        for chat, chat_messages in by_chat.items():
+            chat_messages.sort(key=lambda m: m["_parsed_time"])
+            chat_index[chat] = (
+                [m["_parsed_time"] for m in chat_messages],
+                [{"text": m.get("text", ""), "time": m["_parsed_time"].isoformat()} for m in chat_messages],
+            )
+        return chat_index
+    
+    def _parse_dex_pairs(self, pairs: List[Dict], address_lower: str) -> Dict:
+        """Token data from the highest liquidity pair trading the address"""
+        # Sections can be null in DexScreener responses
+        pair = max(pairs, key=lambda x: (x.get("liquidity") or {}).get("usd") or 0)
+        
+        base = pair.get("baseToken") or {}
+        if (base.get("address") or "").lower() != address_lower:
+            base = pair.get("quoteToken") or {}
+        liquidity = pair.get("liquidity") or {}
+        price_change = pair.get("priceChange") or {}
+        volume = pair.get("volume") or {}
+        info = pair.get("info") or {}
+        
+        return {
+            "symbol": base.get("symbol", ""),
+            "name": base.get("name", ""),
+            "price_usd": float(pair.get("priceUsd") or 0),
+            "market_cap": pair.get("fdv"),
+            "liquidity_usd": liquidity.get("usd"),
+            "price_change_1h": price_change.get("h1"),
+            "price_change_24h": price_change.get("h24"),
+            "volume_24h": volume.get("h24"),
+            "dex_url": pair.get("url", ""),
+            "image_url": info.get("imageUrl"),
+            "chain": pair.get("chainId", "solana"),
+        }
+    
+    async def _get_dexscreener_batch(self, addresses: List[str]) -> Dict[str, Optional[Dict]]:
+        """
+        Fetch token data for many addresses, DEXSCREENER_BATCH_SIZE per request.
+        
+        Returns:
+            Dict mapping lowercased address to token data (None if not found)
+        """
+        results: Dict[str, Optional[Dict]] = {}
+        to_fetch = []
+        
+        for address in addresses:
+            cache_key = address.lower()
+            cached = self._dex_cache.get(cache_key)
+            if cached is not None or self._dex_misses.get(cache_key):
+                results[cache_key] = cached
+                continue
+            to_fetch.append(address)
+        
+        # Known-bad addresses from earlier runs
+        if to_fetch:
+            persisted_misses = await self._get_persisted_misses([a.lower() for a in to_fetch])
+            if persisted_misses:
+                for cache_key in persisted_misses:
+                    self._dex_misses.set(cache_key, True)
+                    results[cache_key] = None
+                to_fetch = [a for a in to_fetch if a.lower() not in persisted_misses]
+        
+        chunks = [
+            to_fetch[i:i + DEXSCREENER_BATCH_SIZE]
+            for i in range(0, len(to_fetch), DEXSCREENER_BATCH_SIZE)
+        ]
+        for chunk_results in await asyncio.gather(*(
+            self._fetch_dexscreener_chunk(chunk) for chunk in chunks
+        )):
+            results.update(chunk_results)
+        
+        return results
+    
+    async def _fetch_dexscreener_chunk(self, addresses: List[str]) -> Dict[str, Optional[Dict]]:
+        """One DexScreener request for up to DEXSCREENER_BATCH_SIZE addresses"""
+        if len(addresses) == 1:
+            return {addresses[0].lower(): await self._get_dexscreener_data(addresses[0])}
+        
+        try:
+            client = await self._get_client()
+            response = await client.get(
+                f"https://api.dexscreener.com/latest/dex/tokens/{','.join(addresses)}"
+            )
+            if response.status_code != 200:
+                logger.warning("dexscreener_batch_failed", count=len(addresses), status=response.status_code)
+                return {a.lower(): None for a in addresses}
+            pairs = orjson.loads(response.content).get("pairs") or []
+        except Exception as e:
+            logger.warning("dexscreener_batch_failed", count=len(addresses), error=str(e))
+            return {a.lower(): None for a in addresses}
+        
+        # Bucket pairs by the token address they trade
+        pairs_by_addr: Dict[str, List[Dict]] = defaultdict(list)
+        for pair in pairs:
+            base_addr = ((pair.get("baseToken") or {}).get("address") or "").lower()
+            quote_addr = ((pair.get("quoteToken") or {}).get("address") or "").lower()
+            pairs_by_addr[base_addr].append(pair)
+            if quote_addr != base_addr:
+                pairs_by_addr[quote_addr].append(pair)
+        
+        # A full response may have crowded out other tokens' pairs
+        truncated = len(pairs) >= DEXSCREENER_MAX_PAIRS
+        
+        results: Dict[str, Optional[Dict]] = {}
+        missing = []
+        not_found = []
+        for address in addresses:
+            cache_key = address.lower()
+            address_pairs = pairs_by_addr.get(cache_key)
+            if address_pairs:
+                # A malformed pair only costs its own token
+                try:
+                    results[cache_key] = self._parse_dex_pairs(address_pairs, cache_key)
+                except Exception as e:
+                    logger.warning("dexscreener_parse_failed", address=address, error=str(e))
+                    results[cache_key] = None
+                    continue
+                self._dex_cache.set(cache_key, results[cache_key])
+            elif truncated:
+                missing.append(address)
+            else:
+                results[cache_key] = None  # Negative result
+                not_found.append(cache_key)
+        
+        if not_found:
+            await self._record_dex_misses(not_found)
+        
+        if missing:
+            for address, result in zip(missing, await asyncio.gather(*(
+                self._get_dexscreener_data(a) for a in missing
+            ))):
+                results[address.lower()] = result
+        
+        return results
+    
     def _get_context_messages(
         self,
-        all_messages: List[Dict],
+        chat_index: Dict[str, Tuple[List[datetime], List[Dict]]],
         target_chat: str,
         target_time: datetime,
         window_minutes: int = 10
@@ -189,21 +501,55 @@ class ContextualScanner:
         """
         Get messages from the same chat within a time window of the target message.
         This captures the discussion context around a token mention.
+        
+        Returns:
+            {"text", "time"} context entries, sorted by time
         """
-        context = []
+        if target_chat not in chat_index:
+            return []
+        
+        times, chat_messages = chat_index[target_chat]
         window = timedelta(minutes=window_minutes)
+        lo = bisect_left(times, target_time - window)
+        hi = bisect_right(times, target_time + window)
+        return chat_messages[lo:hi]
+    
+    def _build_discussions(
+        self,
+        mentions: List[Dict],
+        chat_index: Dict[str, Tuple[List[datetime], List[Dict]]],
+    ) -> List[Dict]:
+        """Gather the contextual discussion around each of a token's mentions"""
+        discussions = []
+        seen_contexts: Set[Tuple[str, int]] = set()  # Avoid duplicate contexts
         
-        for msg in all_messages:
-            if msg.get("source_name") != target_chat:
+        for mention in mentions:
+            chat = mention["chat"]
+            time = mention["time"]
+            
+            if not time:
                 continue
             
-            msg_time = msg.get("_parsed_time")
-            if msg_time and abs((msg_time - target_time).total_seconds()) <= window.total_seconds():
-                context.append(msg)
+            # Create unique key for this context - skip before any window work
+            minute = time.toordinal() * 1440 + time.hour * 60 + time.minute  # Round to minute
+            context_key = (chat, minute)
+            if context_key in seen_contexts:
+                continue
+            seen_contexts.add(context_key)
+            
+            # Get surrounding messages
+            context_msgs = self._get_context_messages(
+                chat_index, chat, time, self.CONTEXT_WINDOW_MINUTES
+            )
+            
+            if context_msgs:
+                discussions.append({
+                    "chat": chat,
+                    "time": time.isoformat(),
+                    "messages": context_msgs,
+                })
         
-        # Sort by time
-        context.sort(key=lambda m: m.get("_parsed_time", datetime.min))
-        return context
+        return discussions
     
     def _is_discussion_message(self, text: str) -> bool:
         """
@@ -215,65 +561,196 @@ class ContextualScanner:
         # Skip if it's just a link/scan with no commentary
         if len(text) < 50 and any(x in text_lower for x in ['pump.fun/', 'dexscreener.com/', 'birdeye.so/']):
             # Check if there's actual text beyond the link
-            text_without_urls = re.sub(r'https?://\S+', '', text)
+            text_without_urls = URL_REGEX.sub('', text)
             if len(text_without_urls.strip()) < 20:
                 return False
         
         # Skip obvious bot messages
-        bot_patterns = [
-            r'^CA[:\s]',
-            r'^Contract[:\s]',
-            r'^\d+\.\d+[KMB]?\s*\|\s*\d+',  # Price | holders format
-            r'^🔫|^🎯|^📊',  # Common bot emojis at start
-        ]
-        for pattern in bot_patterns:
-            if re.match(pattern, text):
+        for pattern in BOT_MESSAGE_REGEXES:
+            if pattern.match(text):
                 return False
         
         return True
     
-    async def _generate_discussion_summary(
+    def _collect_discussion_texts(self, token: TokenDiscussion, discussions: List[Dict]) -> List[str]:
+        """Collect ALL message texts (less strict filtering), without URLs/addresses"""
+        discussion_texts = []
+        raw_count = 0
+        for disc in discussions:
+            for msg in disc.get("messages", []):
+                raw_count += 1
+                # Context entries are shared across mentions and tokens - clean each once
+                clean = msg.get("clean")
+                if clean is None:
+                    clean = ""
+                    text = msg.get("text", "")
+                    if text and len(text) > 10:  # Just need some text
+                        # Clean up the text
+                        stripped = URL_REGEX.sub('', text)  # Remove URLs entirely
+                        stripped = SOLANA_ADDR_REGEX.sub('', stripped).strip()  # Remove addresses
+                        if len(stripped) > 10:  # Lowered threshold
+                            clean = stripped[:300]
+                    msg["clean"] = clean
+                if clean:
+                    discussion_texts.append(clean)
+        
+        logger.info("discussion_texts_collected", symbol=token.symbol, raw=raw_count, filtered=len(discussion_texts))
+        return discussion_texts
+    
+    def _summary_without_llm(
         self,
         token: TokenDiscussion,
-        discussions: List[Dict]
-    ) -> TokenDiscussion:
-        """Generate AI summary of the discussion context."""
-        logger.info("generating_summary", symbol=token.symbol, discussions=len(discussions), groq_key_set=bool(GROQ_API_KEY))
-        
+        discussions: List[Dict],
+        discussion_texts: List[str]
+    ) -> Optional[str]:
+        """Summary for tokens that don't need (or can't use) the LLM, else None"""
         if not GROQ_API_KEY:
             logger.warning("no_groq_key", symbol=token.symbol)
             # Generate a basic summary without AI
             chat_names = ", ".join(list(token.chats)[:3])
             if len(token.chats) > 3:
                 chat_names += f" and {len(token.chats) - 3} more"
-            token.summary = f"Discussed {token.mention_count} times in {chat_names}. Connect Groq API for AI summaries."
-            return token
+            return f"Discussed {token.mention_count} times in {chat_names}. Connect Groq API for AI summaries."
         
         if not discussions:
-            token.summary = f"Mentioned {token.mention_count} times across {len(token.chats)} chats."
-            return token
+            return f"Mentioned {token.mention_count} times across {len(token.chats)} chats."
         
-        # Collect ALL message texts (less strict filtering)
-        discussion_texts = []
-        raw_count = 0
-        for disc in discussions:
-            for msg in disc.get("messages", []):
-                text = msg.get("text", "")
-                raw_count += 1
-                if text and len(text) > 10:  # Just need some text
-                    # Clean up the text
-                    clean = re.sub(r'https?://\S+', '', text)  # Remove URLs entirely
-                    clean = re.sub(r'[1-9A-HJ-NP-Za-km-z]{32,44}', '', clean)  # Remove addresses
-                    clean = clean.strip()
-                    if len(clean) > 10:  # Lowered threshold
-                        discussion_texts.append(clean[:300])
+        if not discussion_texts:
+            return f"Scanned in {len(token.chats)} chats with {token.mention_count} mentions."
         
-        logger.info("discussion_texts_collected", symbol=token.symbol, raw=raw_count, filtered=len(discussion_texts))
+        return None
+    
+    def _apply_llm_summary(self, token: TokenDiscussion, summary: str):
+        """Store a cleaned LLM summary and the sentiment it expresses"""
+        # Clean up any markdown formatting
+        clean_summary = MARKDOWN_EMPHASIS_REGEX.sub(_emphasis_text, summary.strip())
+        clean_summary = MARKDOWN_LINE_PREFIX_REGEX.sub('', clean_summary)
+        clean_summary = WHITESPACE_REGEX.sub(' ', clean_summary).strip()
+        
+        token.summary = clean_summary[:500]  # Limit length
+        logger.info("summary_generated", symbol=token.symbol, length=len(token.summary))
+        
+        # Extract sentiment from the raw response in one case-insensitive pass
+        found = {SUMMARY_SENTIMENT_WORDS[word.lower()] for word in SUMMARY_SENTIMENT_REGEX.findall(summary)}
+        token.sentiment = next(
+            (sentiment for sentiment in SUMMARY_SENTIMENT_PRIORITY if sentiment in found),
+            'neutral'
+        )
+    
+    async def _post_groq(self, prompt: str, max_tokens: int, json_response: bool = False):
+        """POST one chat completion to Groq (bounded by the LLM semaphore)"""
+        payload = {
+            "model": GROQ_MODEL,
+            "messages": [{"role": "user", "content": prompt}],
+            "max_tokens": max_tokens,
+            "temperature": 0.3,
+        }
+        if json_response:
+            payload["response_format"] = {"type": "json_object"}
+        
+        client = await self._get_client()
+        async with self._llm_semaphore:
+            return await client.post(
+                "https://api.groq.com/openai/v1/chat/completions",
+                headers={
+                    "Authorization": f"Bearer {GROQ_API_KEY}",
+                    "Content-Type": "application/json",
+                },
+                content=orjson.dumps(payload),
+                timeout=20.0,
+            )
+    
+    async def _generate_summaries(self, tokens: List[TokenDiscussion]):
+        """
+        Generate summaries for all tokens.
         
-        if not discussion_texts:
-            token.summary = f"Scanned in {len(token.chats)} chats with {token.mention_count} mentions."
-            return token
+        Tokens needing the LLM are sent SUMMARY_BATCH_SIZE per Groq request.
+        """
+        to_summarize: List[Tuple[TokenDiscussion, List[str]]] = []
+        for token in tokens:
+            logger.info("generating_summary", symbol=token.symbol, discussions=len(token.discussions), groq_key_set=bool(GROQ_API_KEY))
+            discussion_texts = (
+                self._collect_discussion_texts(token, token.discussions)
+                if GROQ_API_KEY and token.discussions else []
+            )
+            summary = self._summary_without_llm(token, token.discussions, discussion_texts)
+            if summary is not None:
+                token.summary = summary
+            else:
+                to_summarize.append((token, discussion_texts))
         
+        groups = [
+            to_summarize[i:i + SUMMARY_BATCH_SIZE]
+            for i in range(0, len(to_summarize), SUMMARY_BATCH_SIZE)
+        ]
+        await asyncio.gather(*(self._summarize_token_group(group) for group in groups))
+    
+    async def _summarize_token_group(self, group: List[Tuple[TokenDiscussion, List[str]]]):
+        """One Groq request for a group of tokens, falling back to per-token requests on a malformed reply"""
+        if len(group) == 1:
+            token, discussion_texts = group[0]
+            await self._summarize_token(token, discussion_texts)
+            return
+        
+        sections = []
+        for n, (token, discussion_texts) in enumerate(group, 1):
+            sample = discussion_texts[:15]  # Limit to 15 messages per token
+            messages_text = "\n".join([f"- {m}" for m in sample])
+            sections.append(f"Token {n}: ${token.symbol}\nMessages:\n{messages_text}")
+        tokens_text = "\n\n".join(sections)
+        
+        prompt = f"""You are analyzing crypto Telegram chat messages about {len(group)} tokens.
+
+{tokens_text}
+
+For each token, write a 2-3 sentence summary of what traders are saying about it. Include:
+- The overall vibe (bullish/bearish/cautious)
+- Any specific price targets, warnings, or calls mentioned
+- Key opinions or concerns
+
+Write each summary in plain text only. No markdown, no bullet points, no headers.
+Respond with JSON: {{"summaries": ["<token 1 summary>", "<token 2 summary>", ...]}} with exactly {len(group)} entries, in token order."""
+        
+        symbols = [token.symbol for token, _ in group]
+        try:
+            logger.info("calling_groq_batch", symbols=symbols)
+            response = await self._post_groq(prompt, max_tokens=300 * len(group), json_response=True)
+            logger.info("groq_response", symbols=symbols, status=response.status_code)
+        except Exception as e:
+            logger.warning("summary_batch_failed", symbols=symbols, error=str(e), error_type=type(e).__name__)
+            response = None
+        
+        if response is None or response.status_code != 200:
+            # Rate limited or down - more requests would only make it worse
+            if response is not None:
+                logger.warning("groq_error_response", symbols=symbols, status=response.status_code, body=response.text[:200])
+            for token, discussion_texts in group:
+                token.summary = self._generate_rule_based_summary(token, discussion_texts)
+            return
+        
+        try:
+            result = orjson.loads(response.content)
+            content = result.get("choices", [{}])[0].get("message", {}).get("content", "")
+            summaries = orjson.loads(content).get("summaries") if content else None
+            if (
+                isinstance(summaries, list)
+                and len(summaries) == len(group)
+                and all(isinstance(summary, str) and summary.strip() for summary in summaries)
+            ):
+                for (token, _), summary in zip(group, summaries):
+                    self._apply_llm_summary(token, summary)
+                return
+            logger.warning("groq_batch_invalid_response", symbols=symbols)
+        except Exception as e:
+            logger.warning("groq_batch_invalid_response", symbols=symbols, error=str(e))
+        
+        # The model answered but not in the expected shape - ask per token
+        await asyncio.gather(*(
+            self._summarize_token(token, discussion_texts) for token, discussion_texts in group
+        ))
+    
+    async def _summarize_token(self, token: TokenDiscussion, discussion_texts: List[str]):
+        """One Groq request summarizing a single token's discussion"""
         # Prepare prompt - request concise plain text
         sample = discussion_texts[:15]  # Limit to 15 messages
         messages_text = "\n".join([f"- {m}" for m in sample])
@@ -292,50 +769,14 @@ IMPORTANT: Write in plain text only. No markdown, no bullet points, no headers.
 
         try:
             logger.info("calling_groq", symbol=token.symbol, msg_count=len(sample))
-            client = await self._get_client()
-            response = await client.post(
-                "https://api.groq.com/openai/v1/chat/completions",
-                headers={
-                    "Authorization": f"Bearer {GROQ_API_KEY}",
-                    "Content-Type": "application/json",
-                },
-                json={
-                    "model": GROQ_MODEL,
-                    "messages": [{"role": "user", "content": prompt}],
-                    "max_tokens": 300,
-                    "temperature": 0.3,
-                },
-                timeout=20.0,
-            )
+            response = await self._post_groq(prompt, max_tokens=300)
             logger.info("groq_response", symbol=token.symbol, status=response.status_code)
             
             if response.status_code == 200:
-                result = response.json()
+                result = orjson.loads(response.content)
                 summary = result.get("choices", [{}])[0].get("message", {}).get("content", "")
                 if summary:
-                    # Clean up any markdown formatting
-                    clean_summary = summary.strip()
-                    clean_summary = re.sub(r'\*\*([^*]+)\*\*', r'\1', clean_summary)  # Remove **bold**
-                    clean_summary = re.sub(r'\*([^*]+)\*', r'\1', clean_summary)  # Remove *italic*
-                    clean_summary = re.sub(r'^#+\s*', '', clean_summary, flags=re.MULTILINE)  # Remove headers
-                    clean_summary = re.sub(r'^\d+\.\s*', '', clean_summary, flags=re.MULTILINE)  # Remove numbered lists
-                    clean_summary = re.sub(r'^[-•]\s*', '', clean_summary, flags=re.MULTILINE)  # Remove bullet points
-                    clean_summary = re.sub(r'\n+', ' ', clean_summary)  # Join multiple lines
-                    clean_summary = re.sub(r'\s+', ' ', clean_summary).strip()  # Normalize spaces
-                    
-                    token.summary = clean_summary[:500]  # Limit length
-                    logger.info("summary_generated", symbol=token.symbol, length=len(token.summary))
-                    
-                    # Extract sentiment from the raw response
-                    summary_lower = summary.lower()
-                    if 'bullish' in summary_lower or 'optimistic' in summary_lower or 'positive' in summary_lower:
-                        token.sentiment = 'bullish'
-                    elif 'bearish' in summary_lower or 'cautious' in summary_lower or 'warning' in summary_lower or 'scam' in summary_lower:
-                        token.sentiment = 'bearish'
-                    elif 'mixed' in summary_lower:
-                        token.sentiment = 'mixed'
-                    else:
-                        token.sentiment = 'neutral'
+                    self._apply_llm_summary(token, summary)
                 else:
                     # Empty response from Groq - use rule-based fallback
                     logger.warning("groq_empty_response", symbol=token.symbol)
@@ -349,8 +790,6 @@ IMPORTANT: Write in plain text only. No markdown, no bullet points, no headers.
             logger.error("summary_failed", symbol=token.symbol, error=str(e), error_type=type(e).__name__)
             # Generate rule-based summary as fallback
             token.summary = self._generate_rule_based_summary(token, discussion_texts)
-        
-        return token
     
     def _generate_rule_based_summary(self, token: TokenDiscussion, texts: List[str]) -> str:
         """Generate a simple rule-based summary when AI is unavailable."""
@@ -396,46 +835,60 @@ IMPORTANT: Write in plain text only. No markdown, no bullet points, no headers.
         """
         logger.info("contextual_scan_start", message_count=len(messages))
         
-        # 1. Parse timestamps
+        # 1. Parse timestamps (messages without a valid one count as now)
+        now = datetime.utcnow()
         for msg in messages:
             ts_str = msg.get("timestamp")
             if ts_str:
                 try:
-                    ts = datetime.fromisoformat(ts_str.replace("Z", "+00:00"))
+                    # fromisoformat accepts a trailing "Z" since Python 3.11
+                    ts = datetime.fromisoformat(ts_str)
                     if ts.tzinfo:
                         ts = ts.replace(tzinfo=None)
                     msg["_parsed_time"] = ts
-                except:
-                    msg["_parsed_time"] = datetime.utcnow()
+                except (ValueError, TypeError):
+                    msg["_parsed_time"] = now
             else:
-                msg["_parsed_time"] = datetime.utcnow()
+                msg["_parsed_time"] = now
         
         # 2. Find all token mentions
         token_mentions: Dict[str, List[Dict]] = defaultdict(list)  # address -> list of mention contexts
         
-        for msg in messages:
-            text = msg.get("text", "")
-            if not text:
-                continue
-            
-            token_info = self._extract_token_from_message(text)
+        extracted = await self._extract_tokens_from_messages(messages)
+        
+        for msg, token_info in zip(messages, extracted):
             if token_info:
                 address, chain = token_info
+                chat = msg.get("source_name", "Unknown")
+                if type(chat) is str:
+                    # One shared string object per chat name across every token's mentions/chats
+                    chat = sys.intern(chat)
                 token_mentions[address.lower()].append({
                     "message": msg,
                     "chain": chain,
-                    "chat": msg.get("source_name", "Unknown"),
+                    "chat": chat,
                     "time": msg.get("_parsed_time"),
                 })
         
         logger.info("tokens_found", count=len(token_mentions))
         
+        # Start the batched DexScreener lookups, and build contexts while they're in flight
+        dex_task = asyncio.create_task(self._get_dexscreener_batch(list(token_mentions)))
+        await asyncio.sleep(0)  # Let the requests go out before the CPU-bound work
+        
         # 3. Build token discussions with context
+        chat_index = self._build_chat_index(messages)
+        discussions_by_address = {
+            address: self._build_discussions(mentions, chat_index)
+            for address, mentions in token_mentions.items()
+        }
+        
+        dex_results = await dex_task
         tokens: Dict[str, TokenDiscussion] = {}
         
         for address, mentions in token_mentions.items():
-            # Get DexScreener data first - skip if not found
-            dex_data = await self._get_dexscreener_data(address)
+            # Skip tokens DexScreener doesn't know
+            dex_data = dex_results.get(address)
             if not dex_data or not dex_data.get("symbol"):
                 logger.debug("skipping_no_dex_data", address=address[:16])
                 continue
@@ -459,53 +912,17 @@ IMPORTANT: Write in plain text only. No markdown, no bullet points, no headers.
                 chats={m["chat"] for m in mentions},
                 first_seen=min(m["time"] for m in mentions if m["time"]),
                 last_seen=max(m["time"] for m in mentions if m["time"]),
+                discussions=discussions_by_address[address],
             )
-            
-            # Gather contextual discussions for each mention
-            discussions = []
-            seen_contexts = set()  # Avoid duplicate contexts
-            
-            for mention in mentions:
-                chat = mention["chat"]
-                time = mention["time"]
-                
-                if not time:
-                    continue
-                
-                # Get surrounding messages
-                context_msgs = self._get_context_messages(
-                    messages, chat, time, self.CONTEXT_WINDOW_MINUTES
-                )
-                
-                # Create unique key for this context
-                context_key = f"{chat}:{time.isoformat()[:16]}"  # Round to minute
-                if context_key in seen_contexts:
-                    continue
-                seen_contexts.add(context_key)
-                
-                if context_msgs:
-                    discussions.append({
-                        "chat": chat,
-                        "time": time.isoformat(),
-                        "messages": [
-                            {"text": m.get("text", ""), "time": m.get("_parsed_time").isoformat() if m.get("_parsed_time") else None}
-                            for m in context_msgs
-                        ],
-                    })
-            
-            token.discussions = discussions
             tokens[address] = token
         
         logger.info("tokens_with_dex_data", count=len(tokens))
         
-        # 4. Generate summaries
-        for token in tokens.values():
-            await self._generate_discussion_summary(token, token.discussions)
+        # 4. Generate summaries (batched Groq requests, bounded by the semaphore)
+        await self._generate_summaries(list(tokens.values()))
         
-        # 5. Sort by last_seen (most recent first) and limit
-        result = list(tokens.values())
-        result.sort(key=lambda t: t.last_seen or datetime.min, reverse=True)
-        result = result[:limit]
+        # 5. Most recent `limit` tokens by last_seen (same order as a full sort)
+        result = heapq.nlargest(limit, tokens.values(), key=lambda t: t.last_seen or datetime.min)
         
         logger.info("scan_complete", returned=len(result))
         return result
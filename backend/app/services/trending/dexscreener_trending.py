@@ -5,24 +5,47 @@ Fetches top trending tokens from DexScreener.
 Focuses on tokens trending in the last 6 hours.
 """
 
+import time
 import httpx
-from typing import Dict, Any, List, Optional
-from datetime import datetime, timedelta
+import orjson
+from typing import Dict, Any, FrozenSet, List, Optional, Tuple
 from dataclasses import dataclass
+from functools import lru_cache
 import asyncio
+import heapq
 import structlog
 
 logger = structlog.get_logger()
 
-# Cache
-_trending_cache: List[Dict[str, Any]] = []
-_cache_time: Optional[datetime] = None
-CACHE_DURATION = timedelta(minutes=3)  # Refresh more frequently for 6h trending
+# Cache (tokens are read-only after parsing, so cached instances are shared with callers)
+_trending_cache: List["TrendingToken"] = []
+_cache_time: Optional[float] = None  # time.monotonic() of the last refresh
+CACHE_DURATION_S = 180  # Refresh more frequently for 6h trending
+STALE_DURATION_S = 600  # Until then, expired data is served while refreshing in the background
 
+# DexScreener chain IDs -> our standard chain names
+CHAIN_MAP = {
+    "solana": "solana",
+    "ethereum": "ethereum",
+    "eth": "ethereum",
+    "base": "base",
+    "bsc": "bsc",
+    "binance": "bsc",
+    "arbitrum": "arbitrum",
+    "polygon": "polygon",
+    "avalanche": "avalanche",
+}
 
-@dataclass
+# Max DexScreener requests in flight at once (boosts, profiles + one search per chain)
+MAX_CONCURRENT_REQUESTS = 5
+
+# Overall deadline per DexScreener request, so one slow endpoint can't stall a refresh
+REQUEST_DEADLINE_S = 5.0
+
+
+@dataclass(slots=True)
 class TrendingToken:
-    """A trending token from DexScreener"""
+    """A trending token from DexScreener (read-only after parsing)"""
     address: str
     symbol: str
     name: str
@@ -57,32 +80,61 @@ class TrendingToken:
         }
 
 
+@lru_cache(maxsize=64)
+def _normalize_chain(chain: str) -> str:
+    """Normalize chain name to our standard format (chain IDs repeat on every item)"""
+    chain = chain.lower()
+    return CHAIN_MAP.get(chain, chain)
+
+
+def _cache_age() -> Optional[float]:
+    """Seconds since the last refresh, None if nothing is cached"""
+    if not _trending_cache or _cache_time is None:
+        return None
+    return time.monotonic() - _cache_time
+
+
+def _activity_score(t: TrendingToken) -> float:
+    """6h activity score (volume + price change) used to rank trending tokens"""
+    score = 0
+    if t.volume_24h:
+        score += t.volume_24h / 1000  # Normalize
+    if t.price_change_6h is not None:
+        score += abs(t.price_change_6h) * 100  # Big movers score higher
+    return score
+
+
 class DexScreenerTrendingService:
     """Service to fetch trending tokens from DexScreener"""
     
     def __init__(self):
         self.base_url = "https://api.dexscreener.com"
         self._client: Optional[httpx.AsyncClient] = None
+        self._request_semaphore = asyncio.Semaphore(MAX_CONCURRENT_REQUESTS)
+        self._refresh_lock = asyncio.Lock()  # One upstream refresh at a time
+        self._refresh_task: Optional[asyncio.Task] = None
     
     async def _get_client(self) -> httpx.AsyncClient:
         if self._client is None or self._client.is_closed:
-            self._client = httpx.AsyncClient(timeout=30.0)
+            # One pooled HTTP/2 connection set - the refresh fan-out multiplexes on it
+            self._client = httpx.AsyncClient(
+                timeout=httpx.Timeout(10.0, connect=5.0),
+                transport=httpx.AsyncHTTPTransport(
+                    http2=True,
+                    limits=httpx.Limits(
+                        max_connections=50,
+                        max_keepalive_connections=20,
+                        keepalive_expiry=60.0,
+                    ),
+                    retries=2,  # connection-level retries only
+                ),
+            )
         return self._client
     
-    def _normalize_chain(self, chain: str) -> str:
-        """Normalize chain name to our standard format"""
-        chain_map = {
-            "solana": "solana",
-            "ethereum": "ethereum",
-            "eth": "ethereum",
-            "base": "base",
-            "bsc": "bsc",
-            "binance": "bsc",
-            "arbitrum": "arbitrum",
-            "polygon": "polygon",
-            "avalanche": "avalanche",
-        }
-        return chain_map.get(chain.lower(), chain.lower())
+    async def close(self):
+        if self._client:
+            await self._client.aclose()
+            self._client = None
     
     async def get_trending_tokens(
         self,
@@ -103,185 +155,210 @@ class DexScreenerTrendingService:
         Returns:
             List of trending tokens
         """
-        global _trending_cache, _cache_time
+        if chains is None:
+            chains = ["solana", "base", "bsc"]
         
         # Check cache
-        if not force_refresh and _cache_time and datetime.utcnow() - _cache_time < CACHE_DURATION:
-            if _trending_cache:
+        if not force_refresh:
+            age = _cache_age()
+            if age is not None and age < CACHE_DURATION_S:
                 logger.info("trending_cache_hit", count=len(_trending_cache))
-                return [TrendingToken(**t) for t in _trending_cache[:limit]]
+                return _trending_cache[:limit]
+            if age is not None and age < STALE_DURATION_S:
+                # Serve stale data now and refresh it in the background
+                if self._refresh_task is None or self._refresh_task.done():
+                    self._refresh_task = asyncio.create_task(
+                        self._refresh_in_background(chains, limit, hours)
+                    )
+                logger.info("trending_cache_stale", count=len(_trending_cache), age=round(age))
+                return _trending_cache[:limit]
         
-        if chains is None:
-            chains = ["solana", "base", "bsc"]
+        # Requests arriving while a refresh is in flight wait for it and
+        # then read its result instead of fetching again
+        async with self._refresh_lock:
+            age = _cache_age()
+            if not force_refresh and age is not None and age < CACHE_DURATION_S:
+                logger.info("trending_cache_hit", count=len(_trending_cache), waited=True)
+                return _trending_cache[:limit]
+            return await self._refresh(chains, limit, hours)
+    
+    async def _refresh_in_background(self, chains: List[str], limit: int, hours: int):
+        try:
+            async with self._refresh_lock:
+                age = _cache_age()
+                if age is not None and age < CACHE_DURATION_S:
+                    return  # Another request already refreshed
+                await self._refresh(chains, limit, hours)
+        except Exception as e:
+            logger.error("trending_background_refresh_failed", error=str(e))
+    
+    async def _refresh(self, chains: List[str], limit: int, hours: int) -> List[TrendingToken]:
+        """Fetch, rank and cache trending tokens"""
+        global _trending_cache, _cache_time
         
-        all_tokens = []
         client = await self._get_client()
+        chain_filter = frozenset(chains)  # Boost/profile items are filtered by chain
         
         try:
-            # 1. Get token boosts (promoted tokens - often trending)
-            try:
-                resp = await client.get(f"{self.base_url}/token-boosts/top/v1")
-                if resp.status_code == 200:
-                    data = resp.json()
-                    for item in data[:50]:
-                        chain = self._normalize_chain(item.get("chainId", ""))
-                        if chain in chains:
-                            token = self._parse_boost_token(item)
-                            if token:
-                                all_tokens.append(token)
-            except Exception as e:
-                logger.warning("boost_fetch_failed", error=str(e))
-            
-            # 2. Get latest token profiles (new tokens getting attention)
-            try:
-                resp = await client.get(f"{self.base_url}/token-profiles/latest/v1")
-                if resp.status_code == 200:
-                    data = resp.json()
-                    for item in data[:50]:
-                        chain = self._normalize_chain(item.get("chainId", ""))
-                        if chain in chains:
-                            token = self._parse_profile_token(item)
-                            if token:
-                                all_tokens.append(token)
-            except Exception as e:
-                logger.warning("profiles_fetch_failed", error=str(e))
-            
-            # 3. Get top gainers on each chain (most active in last 6h)
-            for chain in chains:
-                try:
-                    # Search for tokens with high 6h volume/activity
-                    resp = await client.get(
-                        f"{self.base_url}/latest/dex/search",
-                        params={"q": f"chain:{chain}"}
-                    )
-                    if resp.status_code == 200:
-                        data = resp.json()
-                        pairs = data.get("pairs", [])[:40]
-                        for pair in pairs:
-                            token = self._parse_pair(pair, hours=hours)
-                            if token:
-                                all_tokens.append(token)
-                except Exception as e:
-                    logger.warning("search_fetch_failed", chain=chain, error=str(e))
-                
-                await asyncio.sleep(0.1)  # Rate limiting
-            
-            # Deduplicate by address
-            seen = set()
-            unique_tokens = []
-            for token in all_tokens:
-                key = f"{token.address}:{token.chain}"
-                if key not in seen:
-                    seen.add(key)
-                    unique_tokens.append(token)
+            # Boosts, profiles and per-chain searches are independent - fetch them together
+            results = await asyncio.gather(
+                self._fetch_boost_tokens(client, chain_filter),
+                self._fetch_profile_tokens(client, chain_filter),
+                *(self._fetch_chain_tokens(client, chain, hours) for chain in chains),
+            )
             
-            # Sort by 6h activity (volume + price change)
-            def activity_score(t: TrendingToken) -> float:
-                score = 0
-                if t.volume_24h:
-                    score += t.volume_24h / 1000  # Normalize
-                if t.price_change_6h is not None:
-                    score += abs(t.price_change_6h) * 100  # Big movers score higher
-                return score
+            # Deduplicate by address (first occurrence wins, order preserved)
+            unique: Dict[Tuple[str, str], TrendingToken] = {}
+            for tokens in results:
+                for token in tokens:
+                    unique.setdefault((token.address, token.chain), token)
             
-            unique_tokens.sort(key=activity_score, reverse=True)
+            # Top tokens by 6h activity (volume + price change) - same order as a full sort
+            top_tokens = heapq.nlargest(limit, unique.values(), key=_activity_score)
             
             # Cache the results
-            _trending_cache = [t.to_dict() for t in unique_tokens[:limit]]
-            _cache_time = datetime.utcnow()
+            _trending_cache = top_tokens
+            _cache_time = time.monotonic()
             
-            logger.info("trending_fetched", count=len(unique_tokens))
-            return unique_tokens[:limit]
+            logger.info("trending_fetched", count=len(unique))
+            return top_tokens[:]
             
         except Exception as e:
             logger.error("trending_fetch_error", error=str(e))
             # Return cached data if available
             if _trending_cache:
-                return [TrendingToken(**t) for t in _trending_cache[:limit]]
+                return _trending_cache[:limit]
             return []
     
-    def _parse_boost_token(self, data: Dict[str, Any]) -> Optional[TrendingToken]:
-        """Parse a token from the boosts endpoint"""
+    async def _get(
+        self,
+        client: httpx.AsyncClient,
+        url: str,
+        params: Optional[Dict[str, str]] = None,
+    ) -> Optional[httpx.Response]:
+        """GET under the request semaphore and deadline. None on timeout or network error."""
         try:
-            address = data.get("tokenAddress", "")
-            if not address:
-                return None
-            
-            chain = self._normalize_chain(data.get("chainId", "solana"))
-            
-            return TrendingToken(
-                address=address,
-                symbol=data.get("symbol", "???"),
-                name=data.get("name", data.get("symbol", "Unknown")),
-                chain=chain,
-                price_usd=None,
-                price_change_24h=None,
-                price_change_6h=None,
-                price_change_1h=None,
-                volume_24h=None,
-                volume_6h=None,
-                market_cap=None,
-                liquidity=None,
-                image_url=data.get("icon"),
-                dexscreener_url=f"https://dexscreener.com/{chain}/{address}",
-            )
-        except Exception:
+            async with self._request_semaphore:
+                return await asyncio.wait_for(client.get(url, params=params), REQUEST_DEADLINE_S)
+        except (asyncio.TimeoutError, httpx.RequestError) as e:
+            logger.warning("trending_request_failed", url=url, error=str(e), error_type=type(e).__name__)
             return None
     
-    def _parse_profile_token(self, data: Dict[str, Any]) -> Optional[TrendingToken]:
-        """Parse a token from the profiles endpoint"""
+    async def _fetch_boost_tokens(self, client: httpx.AsyncClient, chains: FrozenSet[str]) -> List[TrendingToken]:
+        """Token boosts (promoted tokens - often trending)"""
+        tokens = []
         try:
-            address = data.get("tokenAddress", "")
-            if not address:
-                return None
-            
-            chain = self._normalize_chain(data.get("chainId", "solana"))
-            
-            return TrendingToken(
-                address=address,
-                symbol=data.get("symbol", "???"),
-                name=data.get("name", data.get("symbol", "Unknown")),
-                chain=chain,
-                price_usd=None,
-                price_change_24h=None,
-                price_change_6h=None,
-                price_change_1h=None,
-                volume_24h=None,
-                volume_6h=None,
-                market_cap=None,
-                liquidity=None,
-                image_url=data.get("icon"),
-                dexscreener_url=f"https://dexscreener.com/{chain}/{address}",
+            resp = await self._get(client, f"{self.base_url}/token-boosts/top/v1")
+            if resp is not None and resp.status_code == 200:
+                data = orjson.loads(resp.content)
+                for item in data[:50]:
+                    chain = _normalize_chain(item.get("chainId", ""))
+                    if chain in chains:
+                        token = self._parse_listed_token(item)
+                        if token:
+                            tokens.append(token)
+        except Exception as e:
+            logger.warning("boost_fetch_failed", error=str(e))
+        return tokens
+    
+    async def _fetch_profile_tokens(self, client: httpx.AsyncClient, chains: FrozenSet[str]) -> List[TrendingToken]:
+        """Latest token profiles (new tokens getting attention)"""
+        tokens = []
+        try:
+            resp = await self._get(client, f"{self.base_url}/token-profiles/latest/v1")
+            if resp is not None and resp.status_code == 200:
+                data = orjson.loads(resp.content)
+                for item in data[:50]:
+                    chain = _normalize_chain(item.get("chainId", ""))
+                    if chain in chains:
+                        token = self._parse_listed_token(item)
+                        if token:
+                            tokens.append(token)
+        except Exception as e:
+            logger.warning("profiles_fetch_failed", error=str(e))
+        return tokens
+    
+    async def _fetch_chain_tokens(self, client: httpx.AsyncClient, chain: str, hours: int) -> List[TrendingToken]:
+        """Top pairs on a chain (most active in last 6h)"""
+        tokens = []
+        try:
+            # Search for tokens with high 6h volume/activity
+            resp = await self._get(
+                client,
+                f"{self.base_url}/latest/dex/search",
+                params={"q": f"chain:{chain}"}
             )
-        except Exception:
+            if resp is not None and resp.status_code == 200:
+                data = orjson.loads(resp.content)
+                pairs = data.get("pairs", [])[:40]
+                for pair in pairs:
+                    token = self._parse_pair(pair, hours=hours)
+                    if token:
+                        tokens.append(token)
+        except Exception as e:
+            logger.warning("search_fetch_failed", chain=chain, error=str(e))
+        return tokens
+    
+    def _parse_listed_token(self, data: Dict[str, Any]) -> Optional[TrendingToken]:
+        """Parse a token from the boosts or profiles endpoint (same item layout)"""
+        # Items reaching here already passed the chainId filter, so nothing below can raise
+        address = data.get("tokenAddress", "")
+        if not address:
             return None
+        
+        chain = _normalize_chain(data.get("chainId", "solana"))
+        
+        return TrendingToken(
+            address=address,
+            symbol=data.get("symbol", "???"),
+            name=data.get("name", data.get("symbol", "Unknown")),
+            chain=chain,
+            price_usd=None,
+            price_change_24h=None,
+            price_change_6h=None,
+            price_change_1h=None,
+            volume_24h=None,
+            volume_6h=None,
+            market_cap=None,
+            liquidity=None,
+            image_url=data.get("icon"),
+            dexscreener_url=f"https://dexscreener.com/{chain}/{address}",
+        )
     
     def _parse_pair(self, pair: Dict[str, Any], hours: int = 6) -> Optional[TrendingToken]:
         """Parse a token from a trading pair"""
         try:
-            base_token = pair.get("baseToken", {})
+            base_token = pair.get("baseToken") or {}
             address = base_token.get("address", "")
             if not address:
                 return None
             
-            chain = self._normalize_chain(pair.get("chainId", "solana"))
-            price_change = pair.get("priceChange", {})
-            volume = pair.get("volume", {})
+            chain = _normalize_chain(pair.get("chainId", "solana"))
+            # Sections can be missing or null - either way the fields are unknown
+            price_change = pair.get("priceChange") or {}
+            volume = pair.get("volume") or {}
+            
+            # Look each numeric field up once
+            price_usd = pair.get("priceUsd")
+            volume_24h = volume.get("h24")
+            volume_6h = volume.get("h6")
+            market_cap = pair.get("marketCap")
+            liquidity = (pair.get("liquidity") or {}).get("usd")
             
             return TrendingToken(
                 address=address,
                 symbol=base_token.get("symbol", "???"),
                 name=base_token.get("name", base_token.get("symbol", "Unknown")),
                 chain=chain,
-                price_usd=float(pair.get("priceUsd", 0)) if pair.get("priceUsd") else None,
+                price_usd=float(price_usd) if price_usd else None,
                 price_change_24h=price_change.get("h24"),
                 price_change_6h=price_change.get("h6"),
                 price_change_1h=price_change.get("h1"),
-                volume_24h=float(volume.get("h24", 0)) if volume.get("h24") else None,
-                volume_6h=float(volume.get("h6", 0)) if volume.get("h6") else None,
-                market_cap=float(pair.get("marketCap", 0)) if pair.get("marketCap") else None,
-                liquidity=float(pair.get("liquidity", {}).get("usd", 0)) if pair.get("liquidity", {}).get("usd") else None,
-                image_url=pair.get("info", {}).get("imageUrl"),
+                volume_24h=float(volume_24h) if volume_24h else None,
+                volume_6h=float(volume_6h) if volume_6h else None,
+                market_cap=float(market_cap) if market_cap else None,
+                liquidity=float(liquidity) if liquidity else None,
+                image_url=(pair.get("info") or {}).get("imageUrl"),
                 dexscreener_url=pair.get("url", f"https://dexscreener.com/{chain}/{address}"),
             )
         except Exception:
@@ -292,14 +369,14 @@ class DexScreenerTrendingService:
         client = await self._get_client()
         
         try:
-            resp = await client.get(f"{self.base_url}/latest/dex/tokens/{address}")
-            if resp.status_code == 200:
-                data = resp.json()
+            resp = await self._get(client, f"{self.base_url}/latest/dex/tokens/{address}")
+            if resp is not None and resp.status_code == 200:
+                data = orjson.loads(resp.content)
                 pairs = data.get("pairs", [])
                 if pairs:
                     # Find the pair for our chain
                     for pair in pairs:
-                        if self._normalize_chain(pair.get("chainId", "")) == chain:
+                        if _normalize_chain(pair.get("chainId", "")) == chain:
                             return self._parse_pair(pair)
                     # Fallback to first pair
                     return self._parse_pair(pairs[0])
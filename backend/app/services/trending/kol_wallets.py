@@ -4,15 +4,24 @@ KOL (Key Opinion Leader) Wallet Tracking
 Tracks known crypto influencer/KOL wallets and their token holdings.
 """
 
+import time
+import hashlib
 import httpx
-from typing import Dict, Any, List, Optional
+import orjson
+from typing import Dict, Any, List, Optional, Tuple
 from dataclasses import dataclass
 from datetime import datetime, timedelta
+from bisect import bisect_right
 import asyncio
 import structlog
 
+from app.services.trending.ttl_cache import TTLCache
+
 logger = structlog.get_logger()
 
+# Token KOL summaries kept at most (LRU beyond that)
+KOL_CACHE_MAX_ENTRIES = 10_000
+
 # Known KOL/Influencer wallets (Solana)
 # Sources: Public data, on-chain analysis
 KNOWN_KOL_WALLETS: Dict[str, Dict[str, Any]] = {
@@ -59,6 +68,22 @@ KNOWN_KOL_WALLETS: Dict[str, Dict[str, Any]] = {
     },
 }
 
+
+
+def _build_kol_lookup() -> Tuple[Tuple[str, Dict[str, Any], str, str], ...]:
+    """(address, info, lowercased name, lowercased handle without @) per KOL, in list order"""
+    return tuple(
+        (addr, info, info["name"].lower(), info["twitter"].lower().replace("@", ""))
+        for addr, info in KNOWN_KOL_WALLETS.items()
+    )
+
+
+# Search views of KNOWN_KOL_WALLETS, rebuilt by KOLWalletService.reload_kols()
+_KOL_LOOKUP = _build_kol_lookup()
+
+# Joins chat messages into one search corpus (never part of a name or handle)
+CORPUS_SEPARATOR = "\x00"
+
 # Additional whale wallets to track (unnamed but significant)
 WHALE_WALLETS: List[str] = [
     "orcACRJYTFjTeo2pV8TfYRTpmqfoYgbVi9GeANXTCc8",
@@ -80,6 +105,12 @@ class KOLHolding:
     last_updated: datetime
 
 
+def compute_kol_version() -> str:
+    """Hash of KNOWN_KOL_WALLETS, so cached summaries can be tied to the KOL list they used"""
+    canonical = orjson.dumps(KNOWN_KOL_WALLETS, option=orjson.OPT_SORT_KEYS)
+    return hashlib.blake2b(canonical, digest_size=8).hexdigest()
+
+
 @dataclass
 class TokenKOLSummary:
     """Summary of KOL activity for a token"""
@@ -107,15 +138,26 @@ class KOLWalletService:
     def __init__(self):
         self.base_url = "https://api.helius.xyz/v0"  # Helius API for Solana
         self._client: Optional[httpx.AsyncClient] = None
-        self._cache: Dict[str, TokenKOLSummary] = {}
-        self._cache_time: Dict[str, datetime] = {}
         self.cache_duration = timedelta(minutes=10)
+        # cache key -> (summary, time.monotonic() when fetched); entries expire after cache_duration
+        self._cache = TTLCache(KOL_CACHE_MAX_ENTRIES, self.cache_duration.total_seconds())
+        # Past this age a cached summary is still served, but refreshed in the background
+        self.refresh_after = timedelta(minutes=8)
+        self._inflight: Dict[str, asyncio.Task] = {}  # cache key -> running refresh
+        # Part of every cache key: entries cached under an older KOL list are never read
+        self._config_version = compute_kol_version()
     
     async def _get_client(self) -> httpx.AsyncClient:
         if self._client is None or self._client.is_closed:
             self._client = httpx.AsyncClient(timeout=30.0)
         return self._client
     
+    def reload_kols(self):
+        """Pick up edits to KNOWN_KOL_WALLETS; summaries cached before them stop being served"""
+        global _KOL_LOOKUP
+        _KOL_LOOKUP = _build_kol_lookup()
+        self._config_version = compute_kol_version()
+    
     def get_known_kols(self) -> List[Dict[str, Any]]:
         """Get list of all known KOL wallets"""
         return [
@@ -144,11 +186,37 @@ class KOLWalletService:
         For now, we return a placeholder that can be enhanced later.
         """
         # Check cache
-        cache_key = f"{chain}:{token_address}"
-        if cache_key in self._cache:
-            if datetime.utcnow() - self._cache_time.get(cache_key, datetime.min) < self.cache_duration:
-                return self._cache[cache_key]
+        cache_key = f"{chain}:{token_address}:{self._config_version}"
+        cached = self._cache.get(cache_key)
+        if cached is not None:
+            summary, fetched_at = cached
+            if time.monotonic() - fetched_at >= self.refresh_after.total_seconds():
+                # Serve the cached summary now and refresh it in the background
+                self._start_refresh(cache_key, token_address, chain)
+            return summary
         
+        # Concurrent misses for the same token share one fetch; shield it so a
+        # cancelled caller doesn't cancel the fetch the others are waiting on
+        return await asyncio.shield(self._start_refresh(cache_key, token_address, chain))
+    
+    def _start_refresh(self, cache_key: str, token_address: str, chain: str) -> asyncio.Task:
+        """Refresh a cached summary, reusing the refresh already running for it"""
+        task = self._inflight.get(cache_key)
+        if task is None:
+            task = asyncio.create_task(self._refresh(cache_key, token_address, chain))
+            self._inflight[cache_key] = task
+        return task
+    
+    async def _refresh(self, cache_key: str, token_address: str, chain: str) -> TokenKOLSummary:
+        try:
+            summary = await self._fetch_kol_holders(token_address, chain)
+            self._cache.set(cache_key, (summary, time.monotonic()))
+            return summary
+        finally:
+            self._inflight.pop(cache_key, None)
+    
+    async def _fetch_kol_holders(self, token_address: str, chain: str) -> TokenKOLSummary:
+        """Look up which KOL wallets hold a token"""
         # For now, return empty summary
         # In production, you'd query the blockchain here
         summary = TokenKOLSummary(
@@ -169,10 +237,6 @@ class KOLWalletService:
         except Exception as e:
             logger.warning("kol_fetch_failed", token=token_address, error=str(e))
         
-        # Cache result
-        self._cache[cache_key] = summary
-        self._cache_time[cache_key] = datetime.utcnow()
-        
         return summary
     
     async def check_kol_activity(
@@ -187,26 +251,43 @@ class KOLWalletService:
         indicating they might be discussing or holding the token.
         """
         named_holders = []
-        mentioned_kols = set()
         
-        # Search messages for KOL mentions
-        for msg in messages:
-            text = (msg.get("text") or "").lower()
+        if messages:
+            # Search all messages at once: find each KOL's first mention in one
+            # joined corpus and map its position back to the message it is in
+            texts = [(msg.get("text") or "").lower() for msg in messages]
+            corpus = CORPUS_SEPARATOR.join(texts)
+            message_starts = []
+            position = 0
+            for text in texts:
+                message_starts.append(position)
+                position += len(text) + len(CORPUS_SEPARATOR)
+            
+            kol_lookup = _KOL_LOOKUP
+            first_mentions = []  # (message index, KOL order)
+            for order, (_, _, name, twitter) in enumerate(kol_lookup):
+                position = corpus.find(name)
+                if position != 0:
+                    # Only a handle mention starting before the name can be earlier -
+                    # stop searching there instead of scanning the rest of the chat
+                    end = len(corpus) if position == -1 else position - 1 + len(twitter)
+                    handle_position = corpus.find(twitter, 0, end)
+                    if handle_position != -1:
+                        position = handle_position
+                if position != -1:
+                    first_mentions.append((bisect_right(message_starts, position) - 1, order))
             
-            for addr, info in KNOWN_KOL_WALLETS.items():
-                name = info["name"].lower()
-                twitter = info["twitter"].lower().replace("@", "")
-                
-                if name in text or twitter in text:
-                    if addr not in mentioned_kols:
-                        mentioned_kols.add(addr)
-                        named_holders.append({
-                            "address": addr,
-                            "name": info["name"],
-                            "twitter": info["twitter"],
-                            "tier": info["tier"],
-                            "mentioned_in_chat": True,
-                        })
+            # Same order as reading message by message: earliest mentioned first
+            first_mentions.sort()
+            for _, order in first_mentions:
+                addr, info, _, _ = kol_lookup[order]
+                named_holders.append({
+                    "address": addr,
+                    "name": info["name"],
+                    "twitter": info["twitter"],
+                    "tier": info["tier"],
+                    "mentioned_in_chat": True,
+                })
         
         return TokenKOLSummary(
             token_address=token_address,
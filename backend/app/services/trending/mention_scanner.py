@@ -13,13 +13,24 @@ Searches for:
 """
 
 import re
-from typing import Dict, Any, List, Optional, Set
+from typing import Dict, Any, List, Optional, Set, Tuple
 from dataclasses import dataclass, field
 from datetime import datetime, timedelta, timezone
+from functools import lru_cache
+from operator import itemgetter
 import structlog
 
 logger = structlog.get_logger()
 
+# Words of a message, for the symbol/misspelling hash lookup
+WORD_REGEX = re.compile(r'\w+')
+
+# Sort key of mentions without a timestamp (same as datetime.min)
+MIN_TIMESTAMP_KEY = datetime.min.replace(tzinfo=timezone.utc).timestamp()
+
+# Runs of non-alphanumeric characters (\w minus "_" is exactly str.isalnum)
+NON_ALNUM_REGEX = re.compile(r'[\W_]+')
+
 # Common misspelling patterns for crypto tickers
 MISSPELLING_RULES = [
     # Double letters
@@ -58,6 +69,65 @@ def generate_misspellings(symbol: str, max_variants: int = 15) -> Set[str]:
     return variants
 
 
+@lru_cache(maxsize=4096)
+def _token_matcher(
+    address: str,
+    symbol: str,
+    name: str = "",
+) -> Tuple[Tuple[str, ...], frozenset, Optional[re.Pattern], Optional[re.Pattern]]:
+    """
+    Build the mention matcher for one token, once.
+    
+    Symbol, name and misspellings that are plain words are matched by
+    looking them up in the message's word set; only the rest need a regex.
+    
+    Returns:
+        (lowercased address substrings, lowercased words,
+         regex over the text (case-insensitive), regex over the lowercased text)
+    """
+    address_lower = address.lower()
+    if len(address) > 12:
+        # Any text containing the full address or an 8-char truncation
+        # also contains the 6-char one, so only those need searching
+        prefix, suffix = address_lower[:6], address_lower[-6:]
+        needles = [prefix] if prefix == suffix else [prefix, suffix]
+    else:
+        needles = [address_lower]
+    
+    words: Set[str] = set()
+    parts: List[str] = []
+    symbol_lower = symbol.lower()
+    escaped = re.escape(symbol)
+    if len(symbol) >= 2 and WORD_REGEX.fullmatch(symbol_lower):
+        # \bSYMBOL\b is a whole word, and covers $SYMBOL
+        words.add(symbol_lower)
+    else:
+        parts.append(rf'\${escaped}\b')
+        if len(symbol) >= 2:
+            parts.append(rf'\b{escaped}\b')
+    
+    if name and len(name) >= 4:
+        name_lower = name.lower()
+        if WORD_REGEX.fullmatch(name_lower):
+            words.add(name_lower)
+        else:
+            parts.append(rf'\b{re.escape(name)}\b')
+    
+    lower_parts: List[str] = []
+    if len(symbol) >= 3:
+        for variant in generate_misspellings(symbol):
+            if len(variant) < 3:
+                continue
+            if WORD_REGEX.fullmatch(variant):
+                words.add(variant)
+            else:
+                lower_parts.append(rf'\b{re.escape(variant)}\b')
+    
+    regex = re.compile("|".join(parts), re.IGNORECASE) if parts else None
+    lower_regex = re.compile("|".join(lower_parts)) if lower_parts else None
+    return tuple(needles), frozenset(words), regex, lower_regex
+
+
 @dataclass
 class TokenMention:
     """A mention of a token in a Telegram message"""
@@ -89,7 +159,7 @@ class TokenMentionSummary:
     chain: str
     total_mentions: int = 0
     human_discussions: int = 0  # Count of real discussions (not scans)
-    sources: List[str] = field(default_factory=list)
+    sources: Set[str] = field(default_factory=set)
     mentions: List[TokenMention] = field(default_factory=list)
     sentiment_bullish: int = 0
     sentiment_bearish: int = 0
@@ -105,7 +175,7 @@ class TokenMentionSummary:
             "chain": self.chain,
             "total_mentions": self.total_mentions,
             "human_discussions": self.human_discussions,
-            "sources": list(set(self.sources)),
+            "sources": sorted(self.sources),
             "mentions": human_mentions[:20],  # Limit to 20 for API
             "sentiment": {
                 "bullish": self.sentiment_bullish,
@@ -160,8 +230,17 @@ class MentionScanner:
     ]
     
     def __init__(self):
-        self._scan_patterns = [re.compile(p, re.IGNORECASE) for p in self.SCAN_PATTERNS]
-        self._discussion_patterns = [re.compile(p, re.IGNORECASE) for p in self.DISCUSSION_PATTERNS]
+        # Unanchored scan patterns stay separate: most are literals, which re finds
+        # faster one at a time than through an alternation. The ^-anchored ones only
+        # need one match() at the start, and the discussion word lists fuse well.
+        prefixes = [p[1:] for p in self.SCAN_PATTERNS if p.startswith('^')]
+        self._scan_prefix_regex = re.compile("|".join(f"(?:{p})" for p in prefixes), re.IGNORECASE)
+        self._scan_patterns = [
+            re.compile(p, re.IGNORECASE) for p in self.SCAN_PATTERNS if not p.startswith('^')
+        ]
+        self._discussion_regex = re.compile(
+            "|".join(f"(?:{p})" for p in self.DISCUSSION_PATTERNS), re.IGNORECASE
+        )
     
     def _is_scan_message(self, text: str) -> bool:
         """Check if message is a bot/scan message"""
@@ -169,6 +248,8 @@ class MentionScanner:
             return True
         
         # Check for scan patterns
+        if self._scan_prefix_regex.match(text):
+            return True
         for pattern in self._scan_patterns:
             if pattern.search(text):
                 return True
@@ -176,7 +257,7 @@ class MentionScanner:
         # If message is mostly a contract address
         if len(text) < 100:
             # Count alphanumeric characters that look like an address
-            addr_chars = sum(1 for c in text if c.isalnum())
+            addr_chars = len(NON_ALNUM_REGEX.sub('', text))
             if addr_chars > len(text) * 0.7:
                 return True
         
@@ -187,14 +268,12 @@ class MentionScanner:
         if self._is_scan_message(text):
             return False
         
-        # Must have some discussion indicators
-        has_discussion = any(p.search(text) for p in self._discussion_patterns)
-        
-        # Or be a reasonably long message
+        # A reasonably long message counts as discussion
         if len(text) > 50:
-            has_discussion = True
+            return True
         
-        return has_discussion
+        # Otherwise it must have some discussion indicators
+        return self._discussion_regex.search(text) is not None
     
     def _get_sentiment(self, text: str) -> str:
         """Determine sentiment of message"""
@@ -209,66 +288,90 @@ class MentionScanner:
             return "bearish"
         return "neutral"
     
-    def _message_mentions_token(
-        self,
-        text: str,
-        address: str,
-        symbol: str,
-        name: str = "",
-    ) -> bool:
-        """
-        Check if a message mentions a specific token.
+    @staticmethod
+    def _matches_unindexed(text: str, text_lower: str, matcher) -> bool:
+        """Check a message against the parts of a token matcher that aren't word lookups"""
+        needles, _, regex, lower_regex = matcher
         
-        Searches for:
-        - Full contract address
-        - Truncated address (first/last 6-8 chars)
-        - $TICKER format
-        - TICKER as word
-        - Token name
-        - Common misspellings
-        """
-        text_lower = text.lower()
+        # Full/truncated address (common in chats, often inside URLs)
+        for needle in needles:
+            if needle in text_lower:
+                return True
         
-        # 1. Check for full contract address
-        if address.lower() in text_lower:
+        if regex is not None and regex.search(text):
             return True
+        return lower_regex is not None and lower_regex.search(text_lower) is not None
+    
+    def _classify(self, text: str, by_text: Dict[str, Tuple[bool, str]]) -> Tuple[bool, str]:
+        """
+        Discussion flag and sentiment of a message.
         
-        # 2. Check for truncated address (common in chats)
-        if len(address) > 12:
-            # First 6-8 chars
-            for length in [8, 6]:
-                if address[:length].lower() in text_lower:
-                    return True
-                if address[-length:].lower() in text_lower:
-                    return True
-        
-        # 3. Check for $SYMBOL (most common format)
-        symbol_pattern = rf'\${re.escape(symbol)}\b'
-        if re.search(symbol_pattern, text, re.IGNORECASE):
-            return True
+        Both depend only on the text, so they are looked up in `by_text`
+        first: forwarded calls repeat verbatim across chats.
+        """
+        text_class = by_text.get(text)
+        if text_class is None:
+            text_class = by_text[text] = (self._is_human_discussion(text), self._get_sentiment(text))
+        return text_class
+    
+    @staticmethod
+    def _parse_timestamp(msg: Dict[str, Any]) -> Optional[datetime]:
+        """Parse a message's timestamp, None if missing/invalid"""
+        timestamp = None
+        if msg.get("timestamp"):
+            try:
+                ts_str = msg["timestamp"]
+                if isinstance(ts_str, str):
+                    timestamp = datetime.fromisoformat(ts_str.replace("Z", "+00:00"))
+                elif isinstance(ts_str, datetime):
+                    timestamp = ts_str
+            except:
+                pass
+        return timestamp
+    
+    @staticmethod
+    def _timestamp_key(timestamp: Optional[datetime]) -> float:
+        """Sort key for a timestamp; naive ones are taken as UTC, missing ones sort oldest"""
+        if timestamp is None:
+            return MIN_TIMESTAMP_KEY
+        if timestamp.tzinfo is None:
+            timestamp = timestamp.replace(tzinfo=timezone.utc)
+        return timestamp.timestamp()
+    
+    @staticmethod
+    def _record_mention(
+        summary: TokenMentionSummary,
+        msg: Dict[str, Any],
+        text: str,
+        timestamp: Optional[datetime],
+        classified: Tuple[bool, str],
+    ):
+        """Add a mentioning message to a token's summary"""
+        is_human, sentiment = classified
+        summary.total_mentions += 1
         
-        # 4. Check for SYMBOL as word boundary
-        if len(symbol) >= 2:
-            symbol_word_pattern = rf'\b{re.escape(symbol)}\b'
-            if re.search(symbol_word_pattern, text, re.IGNORECASE):
-                return True
+        source_name = msg.get("source_name", "Unknown")
+        summary.sources.add(source_name)
         
-        # 5. Check for token name (if provided and long enough)
-        if name and len(name) >= 4:
-            name_pattern = rf'\b{re.escape(name)}\b'
-            if re.search(name_pattern, text, re.IGNORECASE):
-                return True
+        if is_human:
+            summary.human_discussions += 1
         
-        # 6. Check for common misspellings of ticker
-        if len(symbol) >= 3:
-            misspellings = generate_misspellings(symbol)
-            for variant in misspellings:
-                if len(variant) >= 3:
-                    variant_pattern = rf'\b{re.escape(variant)}\b'
-                    if re.search(variant_pattern, text_lower):
-                        return True
+        if sentiment == "bullish":
+            summary.sentiment_bullish += 1
+        elif sentiment == "bearish":
+            summary.sentiment_bearish += 1
+        else:
+            summary.sentiment_neutral += 1
         
-        return False
+        summary.mentions.append(TokenMention(
+            text=text[:500],  # Limit text length
+            source_name=source_name,
+            source_id=str(msg.get("source_id", "")),
+            message_id=msg.get("message_id", 0),
+            timestamp=timestamp,
+            is_human_discussion=is_human,
+            sentiment=sentiment,
+        ))
     
     def scan_messages_for_token(
         self,
@@ -296,66 +399,7 @@ class MentionScanner:
             symbol=symbol,
             chain=chain,
         )
-        
-        for msg in messages:
-            text = msg.get("text", "")
-            if not text:
-                continue
-            
-            # Check if message mentions this token (including name and misspellings)
-            if not self._message_mentions_token(text, address, symbol, name):
-                continue
-            
-            # Found a mention!
-            summary.total_mentions += 1
-            
-            source_name = msg.get("source_name", "Unknown")
-            if source_name not in summary.sources:
-                summary.sources.append(source_name)
-            
-            # Determine if it's human discussion
-            is_human = self._is_human_discussion(text)
-            if is_human:
-                summary.human_discussions += 1
-            
-            # Get sentiment
-            sentiment = self._get_sentiment(text)
-            if sentiment == "bullish":
-                summary.sentiment_bullish += 1
-            elif sentiment == "bearish":
-                summary.sentiment_bearish += 1
-            else:
-                summary.sentiment_neutral += 1
-            
-            # Parse timestamp
-            timestamp = None
-            if msg.get("timestamp"):
-                try:
-                    ts_str = msg["timestamp"]
-                    if isinstance(ts_str, str):
-                        timestamp = datetime.fromisoformat(ts_str.replace("Z", "+00:00"))
-                    elif isinstance(ts_str, datetime):
-                        timestamp = ts_str
-                except:
-                    pass
-            
-            mention = TokenMention(
-                text=text[:500],  # Limit text length
-                source_name=source_name,
-                source_id=str(msg.get("source_id", "")),
-                message_id=msg.get("message_id", 0),
-                timestamp=timestamp,
-                is_human_discussion=is_human,
-                sentiment=sentiment,
-            )
-            summary.mentions.append(mention)
-        
-        # Sort mentions by timestamp (newest first)
-        summary.mentions.sort(
-            key=lambda m: m.timestamp or datetime.min,
-            reverse=True,
-        )
-        
+        self._scan(messages, [(summary, _token_matcher(address, symbol, name))])
         return summary
     
     def scan_messages_for_tokens(
@@ -369,8 +413,7 @@ class MentionScanner:
         Returns:
             Dict mapping token address to TokenMentionSummary
         """
-        results = {}
-        
+        entries = {}
         for token in tokens:
             address = token.get("address", "")
             symbol = token.get("symbol", "")
@@ -379,10 +422,58 @@ class MentionScanner:
             if not address:
                 continue
             
-            summary = self.scan_messages_for_token(messages, address, symbol, chain)
-            results[address] = summary
+            # A repeated address keeps its first position but the last token's fields
+            summary = TokenMentionSummary(address=address, symbol=symbol, chain=chain)
+            entries[address] = (summary, _token_matcher(address, symbol))
+        
+        self._scan(messages, list(entries.values()))
+        return {address: summary for address, (summary, _) in entries.items()}
+    
+    def _scan(self, messages: List[Dict[str, Any]], entries: List[Tuple[TokenMentionSummary, Any]]):
+        """
+        Record every mention of the given tokens, visiting each message once.
+        
+        Each message is lowercased and split into words once; word-like
+        symbols, names and misspellings are resolved with one dict lookup
+        per word instead of a regex per token, and a message is classified
+        (discussion, sentiment) only once however many tokens it mentions -
+        identical texts only once per scan.
+        """
+        # word -> positions in `entries` of the tokens it mentions
+        word_index: Dict[str, List[int]] = {}
+        for i, (_, matcher) in enumerate(entries):
+            for word in matcher[1]:
+                word_index.setdefault(word, []).append(i)
         
-        return results
+        # Visit messages newest first, so every token's mentions come out
+        # already in order. The sort is stable: equal timestamps keep message order.
+        dated = []
+        for msg in messages:
+            text = msg.get("text", "")
+            if text:
+                timestamp = self._parse_timestamp(msg)
+                dated.append((self._timestamp_key(timestamp), timestamp, text, msg))
+        dated.sort(key=itemgetter(0), reverse=True)
+        
+        matched: Set[int] = set()
+        by_text: Dict[str, Tuple[bool, str]] = {}  # discussion flag/sentiment per distinct text
+        for _, timestamp, text, msg in dated:
+            text_lower = text.lower()
+            if word_index:
+                matched.clear()
+                for word in set(WORD_REGEX.findall(text_lower)):
+                    positions = word_index.get(word)
+                    if positions is not None:
+                        matched.update(positions)
+            
+            classified = None
+            for i, (summary, matcher) in enumerate(entries):
+                if i not in matched and not self._matches_unindexed(text, text_lower, matcher):
+                    continue
+                
+                if classified is None:
+                    classified = self._classify(text, by_text)
+                self._record_mention(summary, msg, text, timestamp, classified)
 
 
 # Singleton
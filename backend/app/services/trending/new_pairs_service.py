@@ -19,7 +19,7 @@ import structlog
 logger = structlog.get_logger()
 
 # Cache
-_new_pairs_cache: List[Dict[str, Any]] = []
+_new_pairs_cache: List["NewPairToken"] = []  # Instances are shared with callers
 _cache_time: Optional[datetime] = None
 CACHE_DURATION = timedelta(minutes=2)  # Refresh frequently for new pairs
 
@@ -588,7 +588,7 @@ class NewPairsService:
         if not force_refresh and _cache_time and datetime.utcnow() - _cache_time < CACHE_DURATION:
             if _new_pairs_cache:
                 logger.info("new_pairs_cache_hit", count=len(_new_pairs_cache))
-                return [NewPairToken(**p) for p in _new_pairs_cache[:limit]]
+                return _new_pairs_cache[:limit]
         
         if chains is None:
             chains = ["solana", "base", "bsc"]
@@ -804,7 +804,7 @@ class NewPairsService:
                 filtered_pairs.append(new_pair)
         
         # Cache results
-        _new_pairs_cache = [p.to_dict() for p in filtered_pairs[:limit]]
+        _new_pairs_cache = filtered_pairs[:limit]
         _cache_time = datetime.utcnow()
         
         logger.info("new_pairs_filtered", count=len(filtered_pairs))